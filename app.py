@@ -100,6 +100,7 @@ def handle_price_match(product_url, claude_controller):
 
             response = claude_controller.chat(
                 messages=st.session_state.messages,
+                session_id=st.session_state.session_id,
             )
                     
             if response["success"]:
@@ -151,6 +152,7 @@ def handle_user_query(query, claude_controller):
         with st.spinner("Thinking..."):
             response = claude_controller.chat(
                 messages=st.session_state.messages,
+                session_id=st.session_state.session_id,
             )
             if response["success"]:
                 # Display the response
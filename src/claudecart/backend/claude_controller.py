@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Optional
 from anthropic import Anthropic
 
 from claudecart.mcp_tools.search_tools import search_competitor_prices, get_price_match_policy
+from claudecart.mcp_tools.tool_memo import SessionMemoStore
 from claudecart.mcp_tools.tool_registry import tool_registry
 
 
@@ -21,6 +22,9 @@ class ClaudeController:
         self,
         api_key: str,
         model_name: str = "claude-3-7-sonnet-latest",
+        max_tool_rounds: int = 5,
+        client: Optional[Anthropic] = None,
+        base_url: Optional[str] = None,
     ) -> None:
         """
         Initialize the Claude controller.
@@ -28,9 +32,16 @@ class ClaudeController:
         Args:
             api_key: Anthropic API key for authentication
             model_name: Name of the Claude model to use
+            max_tool_rounds: Maximum tool-use round trips per chat turn
+            client: Preconfigured Anthropic client to use instead of creating one
+            base_url: Alternate API endpoint, e.g. a local stub server
         """
-        self.client = Anthropic(api_key=api_key)
+        self.client = client or Anthropic(api_key=api_key, base_url=base_url)
         self.model_name = model_name
+        self.max_tool_rounds = max_tool_rounds
+        
+        # Per-conversation memo of idempotent tool results
+        self.tool_memos = SessionMemoStore()
 
         # Load tool definitions from schema file
         try:
@@ -45,6 +56,7 @@ class ClaudeController:
         When analyzing product information, use these tools:
         1. get_price_match_policy - Check which competitors are allowed for price matching
         2. search_competitor_prices - Search for the product at competitor retailers
+        3. get_facets - See which categories, brands, price ranges and ratings we carry
 
         Extract product details from the provided content, then search for competitor prices and provide clear recommendations."""
 
@@ -69,7 +81,11 @@ class ClaudeController:
         Send messages to Claude and get a response.
         
         This method handles the communication with Claude's API, including
-        error handling and response formatting.
+        error handling and response formatting. When Claude asks for a tool,
+        the tool is executed and its result sent back until Claude answers
+        in text. After max_tool_rounds the final request forbids tool use,
+        so the answer is always text; if Claude still asks for a tool the
+        call fails.
         
         Args:
             messages: List of message objects with role and content
@@ -82,21 +98,55 @@ class ClaudeController:
             session_id = str(uuid.uuid4())
         
         try:
-            response = self.client.messages.create(
-                model=self.model_name,
-                max_tokens=1024,
-                system=self.system_prompt,
-                messages=messages
-            )
+            conversation = list(messages)
+            request = {
+                "model": self.model_name,
+                "max_tokens": 1024,
+                "system": self.system_prompt,
+            }
+            if self.tool_definitions:
+                request["tools"] = self.tool_definitions
+            
+            input_tokens = output_tokens = 0
+            for round_number in range(self.max_tool_rounds + 1):
+                if self.tool_definitions and round_number == self.max_tool_rounds:
+                    # Out of tool rounds: the tools stay defined (the conversation
+                    # holds tool_use blocks) but Claude must answer in text
+                    request["tool_choice"] = {"type": "none"}
+                response = self.client.messages.create(messages=conversation, **request)
+                input_tokens += response.usage.input_tokens
+                output_tokens += response.usage.output_tokens
+                
+                if response.stop_reason != "tool_use":
+                    break
+                if round_number == self.max_tool_rounds:
+                    raise RuntimeError(f"no answer after {self.max_tool_rounds} tool rounds")
+                
+                tool_results = [
+                    {
+                        "type": "tool_result",
+                        "tool_use_id": block.id,
+                        "content": json.dumps(
+                            self._execute_tool(block.name, block.input, session_id),
+                            default=str,
+                        ),
+                    }
+                    for block in response.content
+                    if block.type == "tool_use"
+                ]
+                conversation.append({"role": "assistant", "content": response.content})
+                conversation.append({"role": "user", "content": tool_results})
             
             return {
-                "content": response.content[0].text,
+                "content": "".join(
+                    block.text for block in response.content if block.type == "text"
+                ),
                 "success": True,
                 "session_id": session_id,
                 "model": self.model_name,
                 "usage": {
-                    "input_tokens": response.usage.input_tokens,
-                    "output_tokens": response.usage.output_tokens
+                    "input_tokens": input_tokens,
+                    "output_tokens": output_tokens
                 }
             }
             
@@ -125,16 +175,61 @@ class ClaudeController:
 
         What can I help you with today?"""
 
-    def _execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> Dict[str, Any]:
+    def _execute_tool(
+        self,
+        tool_name: str,
+        tool_input: Dict[str, Any],
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Execute a specified MCP tool.
         
+        Tools registered as idempotent are memoized per conversation, so a
+        repeated call with the same input within the tool's TTL returns the
+        earlier result without running the tool again.
+        
         Args:
             tool_name: Name of the tool to execute
             tool_input: Parameters to pass to the tool
+            session_id: Conversation the call belongs to, enables memoization
             
         Returns:
             Tool execution results or error information
         """
+        policy = tool_registry.get_policy(tool_name)
+        if session_id is None or policy is None or not policy.idempotent:
+            return tool_registry.execute_tool(tool_name, tool_input)
+        
+        memo = self.tool_memos.for_session(session_id)
+        found, result = memo.get(tool_name, tool_input)
+        if found:
+            return result
+        
         # Use tool registry to execute the tool
-        return tool_registry.execute_tool(tool_name, tool_input)
\ No newline at end of file
+        result = tool_registry.execute_tool(tool_name, tool_input)
+        if self._is_cacheable(result):
+            memo.put(tool_name, tool_input, result, policy.cache_ttl)
+        return result
+    
+    @staticmethod
+    def _is_cacheable(result: Any) -> bool:
+        """
+        Whether a tool result is a complete success worth memoizing.
+        
+        Errors, empty results and lists with an empty entry (e.g. a retailer
+        whose price lookup failed) are not cached, so the conversation sees
+        fresh data as soon as the dependency recovers.
+        
+        Args:
+            result: Value returned by the tool registry
+            
+        Returns:
+            True if the result may be memoized
+        """
+        if isinstance(result, dict) and "error" in result:
+            return False
+        if result is None or result == [] or result == {}:
+            return False
+        if isinstance(result, list) and any(item in (None, [], {}) for item in result):
+            return False
+        return True
\ No newline at end of file
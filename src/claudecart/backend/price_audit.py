@@ -0,0 +1,382 @@
+import copy
+import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from anthropic import Anthropic
+
+from claudecart.database.sqlite_manager import SQLiteManager
+from claudecart.mcp_tools.search_tools import get_price_match_policy, search_competitor_prices
+from claudecart.mcp_tools.tool_policy import CircuitBreaker
+from claudecart.mcp_tools.tool_registry import ToolRegistry
+from claudecart.utils.rate_limiter import RateLimiter
+
+
+AUDIT_SYSTEM_PROMPT = """You are a pricing analyst for ClaudeCart, an online retailer.
+You are given one of our products, our price, and web search results from competitor retailers.
+For each competitor, find the competitor's price for the same product (same model, brand and
+specifications) and decide whether it qualifies for our price match policy:
+
+{policy}
+
+Reply with only a JSON array, one object per competitor, with the keys:
+"competitor" (string), "competitor_price" (number, or null if no price was found),
+"price_match_eligible" (boolean) and "recommendation" (one short sentence)."""
+
+
+class AuditCheckpoint:
+    """
+    Progress of a price-audit run.
+
+    Holds the run ID, the ID of the last product submitted for analysis,
+    the Message Batches still being processed and the products whose
+    search or analysis failed. Like the indexing checkpoint, the file is
+    rewritten atomically after every change.
+    """
+
+    def __init__(self, path: str, reset: bool = False):
+        """
+        Load (or start) a checkpoint.
+
+        A finished run is never resumed: the next invocation starts a new
+        run with a new run ID. A run with failed products is not finished,
+        so the next invocation retries them.
+
+        Args:
+            path: Checkpoint file path
+            reset: Discard any unfinished run and start from scratch
+        """
+        self.path = path
+        state: Dict[str, Any] = {}
+        if not reset and os.path.exists(path):
+            with open(path, "r") as f:
+                state = json.load(f)
+        if not state or state.get("finished"):
+            state = {"run_id": uuid.uuid4().hex[:12], "cursor": 0, "submitted": 0, "pending": [], "stats": {}}
+
+        self.run_id: str = state["run_id"]
+        self.cursor: int = state["cursor"]
+        self.submitted: int = state["submitted"]
+        self.pending: List[Dict[str, Any]] = state["pending"]
+        self.stats: Dict[str, int] = state["stats"]
+        self.failed: set = set(state.get("failed", []))
+        self.finished = False
+
+    def save(self) -> None:
+        """Persist the checkpoint atomically."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "run_id": self.run_id,
+                "cursor": self.cursor,
+                "submitted": self.submitted,
+                "pending": self.pending,
+                "stats": self.stats,
+                "failed": sorted(self.failed),
+                "finished": self.finished,
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def count(self, key: str, amount: int = 1) -> None:
+        """Add to a run counter."""
+        self.stats[key] = self.stats.get(key, 0) + amount
+
+
+class PriceAuditJob:
+    """
+    Bulk competitor price audit over the product catalog.
+
+    Products are read from SQLite in ID-ordered chunks. For each chunk the
+    competitor searches fan out over a thread pool, bounded by the job's
+    concurrency and a shared rate limiter, and the analysis
+    of the whole chunk is submitted as one Message Batch. Several batches
+    are processed server-side while the next chunks are being searched;
+    finished batches are parsed and written to the price_history table.
+
+    The checkpoint records the last submitted product and the batches in
+    flight, so an interrupted run resumes by collecting those batches and
+    continuing after the last submitted product, without searching again.
+    While the search circuit is open the job waits for it to recover
+    instead of skipping products; products that still fail are recorded
+    and retried in a second pass, and on the next invocation.
+    """
+
+    SEARCH_TOOL = "search_competitor_prices"
+
+    def __init__(
+        self,
+        client: Anthropic,
+        sqlite_manager: SQLiteManager,
+        checkpoint: AuditCheckpoint,
+        retailers: Optional[List[str]] = None,
+        model_name: str = "claude-3-5-haiku-latest",
+        concurrency: int = 16,
+        searches_per_second: float = 5.0,
+        chunk_size: int = 500,
+        max_pending_batches: int = 4,
+        poll_interval: float = 30.0,
+        max_tokens: int = 1024,
+        max_outage_waits: int = 10,
+        log: Callable[[str], None] = print,
+    ):
+        """
+        Initialize the price-audit job.
+
+        Args:
+            client: Anthropic client used for the Message Batches API
+            sqlite_manager: Source of products and sink for price history
+            checkpoint: Progress of this run
+            retailers: Competitors to search; defaults to Target, Walmart and BestBuy
+            model_name: Model used to analyze the search results
+            concurrency: Concurrent product searches
+            searches_per_second: Search API quota; each product costs one
+                search per retailer, charged again for every retry
+            chunk_size: Products per Message Batch
+            max_pending_batches: Batches allowed in flight before waiting
+            poll_interval: Seconds between batch status checks
+            max_tokens: Maximum tokens per analysis response
+            max_outage_waits: Times a product search waits out an open
+                circuit before the product is recorded as failed
+            log: Function receiving progress messages
+        """
+        self.client = client
+        self.sqlite_manager = sqlite_manager
+        self.checkpoint = checkpoint
+        self.retailers = retailers or ["Target", "Walmart", "BestBuy"]
+        self.model_name = model_name
+        self.concurrency = concurrency
+        # The bucket must hold one product's searches, or acquire() could never succeed
+        self.rate_limiter = RateLimiter(searches_per_second, burst=max(searches_per_second, len(self.retailers)))
+        # Own registry so the job keeps the search tool's timeout, retries and
+        # circuit breaker, with a bulkhead sized for the job instead of chat;
+        # every attempt, retries included, takes rate-limit tokens first
+        self.tools = ToolRegistry()
+        policy = copy.copy(self.tools.get_policy(self.SEARCH_TOOL))
+        policy.max_concurrency = concurrency
+        policy.before_attempt = lambda tool_input: self.rate_limiter.acquire(len(tool_input["retailers"]))
+        self.tools.register_tool(self.SEARCH_TOOL, search_competitor_prices, policy)
+        self.max_outage_waits = max_outage_waits
+        self.chunk_size = chunk_size
+        self.max_pending_batches = max_pending_batches
+        self.poll_interval = poll_interval
+        self.max_tokens = max_tokens
+        self.log = log
+        self.system_prompt = AUDIT_SYSTEM_PROMPT.format(
+            policy=json.dumps(get_price_match_policy("any"), indent=2)
+        )
+
+    def run(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Run (or resume) the audit to completion.
+
+        Args:
+            limit: Maximum number of products audited in this run
+
+        Returns:
+            Run summary with the run ID, counters, the number of products
+            that could not be audited and elapsed time
+        """
+        checkpoint = self.checkpoint
+        started = time.monotonic()
+        if checkpoint.pending:
+            self.log(f"Resuming run {checkpoint.run_id}: {len(checkpoint.pending)} batches in flight, "
+                     f"continuing after product {checkpoint.cursor}")
+
+        remaining = None if limit is None else max(0, limit - checkpoint.submitted)
+        chunks = self.sqlite_manager.iter_product_batches(self.chunk_size, checkpoint.cursor, remaining)
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="price-audit") as pool:
+            for products in chunks:
+                searched = list(pool.map(self._search, products))
+                self._submit_batch(searched)
+                checkpoint.cursor = products[-1]["id"]
+                checkpoint.submitted += len(products)
+                checkpoint.save()
+
+                while len(checkpoint.pending) >= self.max_pending_batches:
+                    self._collect_finished(wait=True)
+
+            while checkpoint.pending:
+                self._collect_finished(wait=True)
+
+            # Retry pass over products that failed in this or an earlier invocation
+            retry_ids = sorted(checkpoint.failed)
+            if retry_ids:
+                self.log(f"Retrying {len(retry_ids)} failed products")
+            for start in range(0, len(retry_ids), self.chunk_size):
+                products = self.sqlite_manager.get_products_by_ids(retry_ids[start:start + self.chunk_size])
+                checkpoint.failed -= set(retry_ids[start:start + self.chunk_size]) - {p["id"] for p in products}
+                self._submit_batch(list(pool.map(self._search, products)))
+                checkpoint.save()
+                while len(checkpoint.pending) >= self.max_pending_batches:
+                    self._collect_finished(wait=True)
+
+        while checkpoint.pending:
+            self._collect_finished(wait=True)
+
+        checkpoint.finished = not checkpoint.failed
+        checkpoint.save()
+        elapsed = time.monotonic() - started
+        return {
+            "run_id": checkpoint.run_id,
+            "elapsed_s": elapsed,
+            **checkpoint.stats,
+            "failed_products": len(checkpoint.failed),
+            "search_tool": self.tools.get_tool_stats(self.SEARCH_TOOL)[self.SEARCH_TOOL],
+        }
+
+    def _search(self, product: Dict[str, Any]) -> Tuple[Dict[str, Any], Any]:
+        """
+        Search competitor prices for one product.
+
+        Rate limiting, the timeout and retries are applied by the tool
+        registry. When the call is rejected because the circuit is open
+        (or the bulkhead is momentarily full) the search waits and tries
+        again rather than giving up on the product.
+        """
+        policy = self.tools.get_policy(self.SEARCH_TOOL)
+        for _ in range(self.max_outage_waits + 1):
+            result = self.tools.execute_tool(self.SEARCH_TOOL, {
+                "product_name": product["name"],
+                "retailers": self.retailers,
+                "brand": product.get("brand"),
+            })
+            if not (isinstance(result, dict) and "error" in result):
+                break
+            if self.tools.get_tool_stats(self.SEARCH_TOOL)[self.SEARCH_TOOL]["circuit"] != CircuitBreaker.CLOSED:
+                time.sleep(policy.recovery_timeout)
+            elif result["error"].startswith("Tool busy"):
+                time.sleep(1.0)
+            else:
+                break
+        return product, result
+
+    def _analysis_request(self, product: Dict[str, Any], search_results: List[Any]) -> Dict[str, Any]:
+        """Build the Message Batch request analyzing one product."""
+        lines = [
+            f"Product: {product['name']}",
+            f"Brand: {product.get('brand') or 'unknown'}",
+            f"SKU: {product.get('sku') or 'unknown'}",
+            f"Our price: ${product.get('price')}",
+        ]
+        for retailer, results in zip(self.retailers, search_results):
+            lines.append(f"\n## {retailer} search results")
+            for result in (results or [])[:5]:
+                lines.append(f"- {result.get('title', '')} ({result.get('url', '')}): "
+                             f"{str(result.get('content', ''))[:300]}")
+            if not results:
+                lines.append("- No results")
+
+        return {
+            "custom_id": f"product-{product['id']}",
+            "params": {
+                "model": self.model_name,
+                "max_tokens": self.max_tokens,
+                "system": self.system_prompt,
+                "messages": [{"role": "user", "content": "\n".join(lines)}],
+            },
+        }
+
+    def _submit_batch(self, searched: List[Tuple[Dict[str, Any], Any]]) -> None:
+        """Submit the analysis of a searched chunk as one Message Batch."""
+        requests = []
+        products: Dict[str, Dict[str, Any]] = {}
+        for product, result in searched:
+            if isinstance(result, dict) and "error" in result:
+                self.checkpoint.count("search_failed")
+                self.checkpoint.failed.add(product["id"])
+                continue
+            self.checkpoint.failed.discard(product["id"])
+            request = self._analysis_request(product, result)
+            requests.append(request)
+            products[request["custom_id"]] = {
+                "product_id": product["id"], "sku": product.get("sku"), "our_price": product.get("price"),
+            }
+        if not requests:
+            return
+
+        batch = self.client.messages.batches.create(requests=requests)
+        self.checkpoint.pending.append({"batch_id": batch.id, "products": products})
+        self.checkpoint.count("submitted", len(requests))
+        self.log(f"Submitted batch {batch.id}: {len(requests)} products "
+                 f"(after product {searched[-1][0]['id']}, {len(self.checkpoint.pending)} in flight)")
+
+    def _collect_finished(self, wait: bool) -> None:
+        """
+        Write the results of every batch that has ended.
+
+        Args:
+            wait: Sleep one poll interval first if no batch has ended yet
+        """
+        checkpoint = self.checkpoint
+        while True:
+            ended = [
+                pending for pending in checkpoint.pending
+                if self.client.messages.batches.retrieve(pending["batch_id"]).processing_status == "ended"
+            ]
+            if ended or not wait:
+                break
+            time.sleep(self.poll_interval)
+
+        for pending in ended:
+            observations = []
+            for entry in self.client.messages.batches.results(pending["batch_id"]):
+                product = pending["products"].get(entry.custom_id)
+                if product is None:
+                    continue
+                if entry.result.type != "succeeded":
+                    checkpoint.count(f"analysis_{entry.result.type}")
+                    checkpoint.failed.add(product["product_id"])
+                    continue
+                rows = self._parse_analysis(entry.result.message)
+                if rows is None:
+                    checkpoint.count("analysis_unparsed")
+                    checkpoint.failed.add(product["product_id"])
+                    continue
+                checkpoint.count("audited")
+                observations.extend(
+                    {"audit_run_id": checkpoint.run_id, **product, **row} for row in rows
+                )
+
+            # Rows are keyed by run, product and competitor, so rewriting after a crash is harmless
+            written = self.sqlite_manager.record_price_history(observations)
+            checkpoint.count("observations", written)
+            checkpoint.pending.remove(pending)
+            checkpoint.save()
+            self.log(f"Collected batch {pending['batch_id']}: {written} price observations")
+
+    @staticmethod
+    def _parse_analysis(message: Any) -> Optional[List[Dict[str, Any]]]:
+        """
+        Extract competitor rows from an analysis message.
+
+        Args:
+            message: Message returned for one batch request
+
+        Returns:
+            Rows with competitor, competitor_price, price_match_eligible and
+            recommendation, or None if the reply holds no JSON array
+        """
+        text = "".join(block.text for block in message.content if block.type == "text")
+        start, end = text.find("["), text.rfind("]")
+        if start < 0 or end < start:
+            return None
+        try:
+            items = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+
+        rows = []
+        for item in items:
+            if not isinstance(item, dict) or not item.get("competitor"):
+                continue
+            price = item.get("competitor_price")
+            rows.append({
+                "competitor": str(item["competitor"]),
+                "competitor_price": float(price) if isinstance(price, (int, float)) else None,
+                "price_match_eligible": item.get("price_match_eligible"),
+                "recommendation": item.get("recommendation"),
+            })
+        return rows
@@ -0,0 +1,289 @@
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from claudecart.utils.catalog_loader import load_catalog_file, load_jsonl_range, split_jsonl
+
+
+TARGETS = ("sqlite", "vectors")
+
+# Embedding model loaded once per worker process
+_worker_model = None
+
+
+class Shard:
+    """
+    A unit of indexing work: a whole .json file or a byte range of a .jsonl file.
+    """
+
+    def __init__(self, path: str, start: Optional[int] = None, end: Optional[int] = None):
+        """
+        Initialize a shard.
+
+        Args:
+            path: Catalog file path
+            start: Start byte offset for .jsonl shards
+            end: End byte offset for .jsonl shards
+        """
+        self.path = path
+        self.start = start
+        self.end = end
+
+    @property
+    def shard_id(self) -> str:
+        """Stable identifier used in the checkpoint file."""
+        stat = os.stat(self.path)
+        base = f"{os.path.abspath(self.path)}@{stat.st_size}:{int(stat.st_mtime)}"
+        return base if self.start is None else f"{base}#{self.start}-{self.end}"
+
+    def load(self) -> List[Dict[str, Any]]:
+        """Parse the products contained in this shard."""
+        if self.start is None:
+            return load_catalog_file(self.path)
+        return load_jsonl_range(self.path, self.start, self.end)
+
+
+def plan_shards(inputs: List[str], shard_bytes: int) -> List[Shard]:
+    """
+    Expand input paths and split them into shards.
+
+    Args:
+        inputs: Files, directories or glob patterns of catalog files
+        shard_bytes: Target byte size of .jsonl shards
+
+    Returns:
+        List of shards in a deterministic order
+    """
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            paths.extend(glob.glob(os.path.join(pattern, "*.json")))
+            paths.extend(glob.glob(os.path.join(pattern, "*.jsonl")))
+        else:
+            paths.extend(glob.glob(pattern))
+
+    shards = []
+    for path in sorted(set(paths)):
+        if path.endswith(".jsonl"):
+            shards.extend(Shard(path, start, end) for start, end in split_jsonl(path, shard_bytes))
+        else:
+            shards.append(Shard(path))
+    return shards
+
+
+class Checkpoint:
+    """
+    Record of which shards have been written to which stores.
+
+    The file is rewritten atomically after every shard, so a crash leaves
+    either the previous or the new state on disk, never a partial one.
+    """
+
+    def __init__(self, path: str, reset: bool = False):
+        """
+        Load (or start) a checkpoint.
+
+        Args:
+            path: Checkpoint file path
+            reset: Ignore any existing checkpoint and start from scratch
+        """
+        self.path = path
+        self.completed: Dict[str, List[str]] = {}
+        if not reset and os.path.exists(path):
+            with open(path, "r") as f:
+                self.completed = json.load(f).get("completed", {})
+
+    def pending_targets(self, shard_id: str, targets: Tuple[str, ...]) -> Tuple[str, ...]:
+        """Targets that still need to be written for a shard."""
+        done = set(self.completed.get(shard_id, []))
+        return tuple(target for target in targets if target not in done)
+
+    def mark_done(self, shard_id: str, targets: Tuple[str, ...]) -> None:
+        """Record targets as written for a shard and persist the checkpoint."""
+        self.completed[shard_id] = sorted(set(self.completed.get(shard_id, [])) | set(targets))
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"completed": self.completed}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _init_worker(embedding_model: Optional[str]) -> None:
+    """Load the embedding model once per worker process."""
+    global _worker_model
+    if embedding_model:
+        from fastembed import TextEmbedding
+        _worker_model = TextEmbedding(embedding_model)
+
+
+def _process_shard(shard: Shard, targets: Tuple[str, ...]) -> Tuple[Shard, List[Dict[str, Any]], Any]:
+    """
+    Worker entry point: parse a shard and embed its products if needed.
+
+    Args:
+        shard: Shard to process
+        targets: Stores the shard still has to be written to
+
+    Returns:
+        Tuple of (shard, products, embedding matrix or None)
+    """
+    products = shard.load()
+    vectors = None
+    if "vectors" in targets and products:
+        import numpy as np
+        from claudecart.database.vector_manager import VectorManager
+        texts = [VectorManager._product_text(product) for product in products]
+        vectors = np.stack(list(_worker_model.embed(texts))).astype(np.float32)
+    return shard, products, vectors
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the indexing job.
+
+    Input files are split into shards that a pool of worker processes
+    parses and embeds. This process is the single writer for both stores:
+    it bulk-loads each finished shard and records it in the checkpoint,
+    so an interrupted run resumes with the shards it had not finished.
+    Only a bounded window of shards is in flight at once, so the parent
+    never holds more than a few shards' products and embeddings.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code
+    """
+    targets = (args.only,) if args.only else TARGETS
+    shards = plan_shards(args.inputs, args.shard_bytes)
+    checkpoint = Checkpoint(args.checkpoint, reset=args.restart)
+
+    work = []
+    for shard in shards:
+        pending = checkpoint.pending_targets(shard.shard_id, targets)
+        if pending:
+            work.append((shard, pending))
+
+    print(f"{len(shards)} shards, {len(shards) - len(work)} already done, {len(work)} to index "
+          f"({', '.join(targets)}) with {args.workers} workers")
+    if not work:
+        return 0
+
+    sqlite_manager = vector_manager = None
+    if "sqlite" in targets:
+        from claudecart.database.sqlite_manager import SQLiteManager
+        sqlite_manager = SQLiteManager(args.db_path)
+    if "vectors" in targets:
+        from claudecart.database.vector_manager import VectorManager
+        vector_manager = VectorManager(args.vector_path, embedding_model=args.embedding_model)
+
+    started = time.monotonic()
+    indexed = 0
+    failed = 0
+    embedding_model = args.embedding_model if "vectors" in targets else None
+
+    done = 0
+    queue = iter(work)
+    in_flight: Dict[Any, Tuple[Shard, Tuple[str, ...]]] = {}
+
+    # Spawn rather than fork: the parent runs LanceDB's threads, which must
+    # not be duplicated into the workers
+    with ProcessPoolExecutor(
+        max_workers=args.workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(embedding_model,),
+    ) as pool:
+        while True:
+            while len(in_flight) < args.workers * 2:
+                item = next(queue, None)
+                if item is None:
+                    break
+                in_flight[pool.submit(_process_shard, *item)] = item
+            if not in_flight:
+                break
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                shard, pending = in_flight.pop(future)
+                done += 1
+                try:
+                    _, products, vectors = future.result()
+                except Exception as e:
+                    failed += 1
+                    print(f"[{done}/{len(work)}] FAILED {shard.shard_id}: {e}", file=sys.stderr)
+                    continue
+
+                # Single writer per store: only this process touches the stores
+                written: List[str] = []
+                try:
+                    if "sqlite" in pending:
+                        sqlite_manager.bulk_load_products(products)
+                        written.append("sqlite")
+                    if "vectors" in pending:
+                        vector_manager.index_products(products, vectors.tolist() if vectors is not None else [])
+                        written.append("vectors")
+                except Exception as e:
+                    failed += 1
+                    print(f"[{done}/{len(work)}] FAILED writing {shard.shard_id}: {e!r}", file=sys.stderr)
+                    continue
+                finally:
+                    if written:
+                        checkpoint.mark_done(shard.shard_id, tuple(written))
+
+                indexed += len(products)
+                elapsed = time.monotonic() - started
+                print(f"[{done}/{len(work)}] {os.path.basename(shard.path)}: {len(products)} products | "
+                      f"{indexed} total, {indexed / elapsed if elapsed else 0.0:.1f} products/sec")
+
+    if vector_manager is not None and not args.skip_neighbors:
+        print("Refreshing similar-product neighbor table...")
+        vector_manager.refresh_neighbors()
+    if vector_manager is not None and vector_manager.build_quantized_index(args.quantization):
+        print("Rebuilt quantized search index")
+
+    elapsed = time.monotonic() - started
+    print(f"Indexed {indexed} products in {elapsed:.1f}s "
+          f"({indexed / elapsed if elapsed else 0.0:.1f} products/sec), {failed} failed shards")
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="claudecart-index",
+        description="Build the ClaudeCart SQLite and vector stores from catalog files.",
+    )
+    parser.add_argument("inputs", nargs="*", default=["data/seed_data"],
+                        help="Catalog files, directories or glob patterns (.json or .jsonl)")
+    parser.add_argument("--only", choices=TARGETS, help="Build only one store")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes")
+    parser.add_argument("--shard-bytes", type=int, default=8 * 1024 * 1024,
+                        help="Target shard size for .jsonl inputs")
+    parser.add_argument("--db-path", default="data/claudecart.db", help="SQLite database path")
+    parser.add_argument("--vector-path", default="vectorstore", help="Vector store directory")
+    parser.add_argument("--embedding-model", default="BAAI/bge-small-en-v1.5",
+                        help="fastembed model used for product embeddings")
+    parser.add_argument("--checkpoint", default=".claudecart-index.checkpoint.json",
+                        help="Checkpoint file used to resume interrupted runs")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and reindex everything")
+    parser.add_argument("--skip-neighbors", action="store_true",
+                        help="Do not refresh the similar-product neighbor table")
+    parser.add_argument("--quantization", choices=("int8", "binary"),
+                        help="Build a quantized search index (an existing one is always rebuilt)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Console script entry point."""
+    sys.exit(run(build_parser().parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from anthropic import Anthropic
+
+from claudecart.backend.price_audit import AuditCheckpoint, PriceAuditJob
+from claudecart.database.sqlite_manager import SQLiteManager
+from claudecart.mcp_tools.search_tools import set_search_client
+from claudecart.utils.tavliy_client import TavilySearchClient
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Run the price-audit job.
+
+    API keys are read from ANTHROPIC_API_KEY and TAVILY_API_KEY. With
+    --stub both APIs are replaced by the local stub server, including its
+    Message Batches endpoints, so the pipeline can be exercised offline.
+
+    Args:
+        args: Parsed command-line arguments
+
+    Returns:
+        Process exit code: 1 if some products could not be audited
+    """
+    stub = None
+    if args.stub:
+        from claudecart.loadtest.stub_server import StubConfig, StubServer
+        stub = StubServer(StubConfig(batch_seconds=args.poll_interval * 2)).start()
+        print(f"Stub APIs on {stub.base_url}")
+        anthropic_key = tavily_key = "stub"
+        base_url = stub.base_url
+    else:
+        anthropic_key = os.environ.get("ANTHROPIC_API_KEY")
+        tavily_key = os.environ.get("TAVILY_API_KEY")
+        base_url = None
+        if not anthropic_key or not tavily_key:
+            print("ANTHROPIC_API_KEY and TAVILY_API_KEY must be set (or use --stub)", file=sys.stderr)
+            return 2
+
+    checkpoint = AuditCheckpoint(args.checkpoint, reset=args.restart)
+    try:
+        set_search_client(TavilySearchClient(api_key=tavily_key, api_base_url=base_url))
+        job = PriceAuditJob(
+            client=Anthropic(api_key=anthropic_key, base_url=base_url),
+            sqlite_manager=SQLiteManager(args.db_path),
+            checkpoint=checkpoint,
+            retailers=args.retailers,
+            model_name=args.model,
+            concurrency=args.concurrency,
+            searches_per_second=args.rate_limit,
+            chunk_size=args.chunk_size,
+            max_pending_batches=args.max_pending_batches,
+            poll_interval=args.poll_interval,
+        )
+        print(f"Price audit run {checkpoint.run_id}: {len(job.retailers)} retailers, "
+              f"{job.concurrency} concurrent searches, {args.rate_limit:g} searches/sec")
+        summary = job.run(limit=args.limit)
+    finally:
+        set_search_client(None)
+        if stub is not None:
+            stub.stop()
+
+    print(json.dumps(summary, indent=2))
+    if summary["failed_products"]:
+        print(f"{summary['failed_products']} products could not be audited; run again to retry them "
+              f"(or pass --restart to abandon them)", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="claudecart-price-audit",
+        description="Audit catalog prices against competitors and record them in the price history.",
+    )
+    parser.add_argument("--db-path", default="data/claudecart.db", help="SQLite database path")
+    parser.add_argument("--retailers", nargs="+", default=["Target", "Walmart", "BestBuy"],
+                        help="Competitor retailers to search")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent product searches")
+    parser.add_argument("--rate-limit", type=float, default=5.0,
+                        help="Search API requests per second")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Products per Message Batch")
+    parser.add_argument("--max-pending-batches", type=int, default=4,
+                        help="Message Batches in flight before waiting for results")
+    parser.add_argument("--poll-interval", type=float, default=30.0,
+                        help="Seconds between batch status checks")
+    parser.add_argument("--model", default="claude-3-5-haiku-latest", help="Model used for the analysis")
+    parser.add_argument("--limit", type=int, help="Audit at most this many products")
+    parser.add_argument("--checkpoint", default=".claudecart-price-audit.checkpoint.json",
+                        help="Checkpoint file used to resume interrupted runs")
+    parser.add_argument("--restart", action="store_true", help="Discard an unfinished run and start over")
+    parser.add_argument("--stub", action="store_true", help="Run against the local API stand-ins")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Console script entry point."""
+    sys.exit(run(build_parser().parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastembed import TextEmbedding
+
+
+class EmbeddingService:
+    """
+    Process-wide embedding service with dynamic micro-batching.
+
+    Callers submit single texts and receive futures. A background thread
+    collects requests that arrive within a short window (or until the batch
+    is full), embeds them in one model call and resolves the futures. All
+    VectorManager instances in the process share one service, and so one
+    copy of the model, per model name.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-small-en-v1.5",
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        """
+        Initialize the embedding service and start its batching thread.
+
+        Args:
+            model_name: Name of the fastembed model to load
+            max_batch_size: Maximum number of texts embedded in one call
+            max_wait_ms: How long to wait for more requests after the first
+        """
+        self.model_name = model_name
+        self.model = TextEmbedding(model_name)
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: "queue.Queue[Optional[Tuple[str, Future]]]" = queue.Queue()
+        self._closed = False
+        self._submit_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._requests = 0
+        self._batches = 0
+        self._last_batch_size = 0
+        self._max_batch_size_seen = 0
+        self._total_batch_seconds = 0.0
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"embedding-service-{model_name}", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a text for embedding.
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Future resolving to the embedding vector as a list of floats
+
+        Raises:
+            RuntimeError: If the service has been shut down
+        """
+        future: Future = Future()
+        with self._submit_lock:
+            if self._closed:
+                raise RuntimeError(f"Embedding service for {self.model_name} is shut down")
+            self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> List[float]:
+        """
+        Embed a single text through the batching queue and wait for it.
+
+        Args:
+            text: Text to embed
+            timeout: Optional seconds to wait for the result
+
+        Returns:
+            Embedding vector
+        """
+        return self.submit(text).result(timeout=timeout)
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed an already-batched list of texts directly, bypassing the queue.
+
+        Intended for offline indexing where callers batch on their own.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors aligned with texts
+        """
+        return [embedding.tolist() for embedding in self.model.embed(texts)]
+
+    def _collect_batch(self) -> Optional[List[Tuple[str, Future]]]:
+        """Block for the first request, then gather more until full or the window closes."""
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self) -> None:
+        """Batching loop executed by the background thread."""
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                return
+
+            # Skip requests whose callers already gave up
+            batch = [(text, future) for text, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            started = time.monotonic()
+            try:
+                embeddings = list(self.model.embed([text for text, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+            else:
+                for (_, future), embedding in zip(batch, embeddings):
+                    future.set_result(embedding.tolist())
+
+            with self._metrics_lock:
+                self._requests += len(batch)
+                self._batches += 1
+                self._last_batch_size = len(batch)
+                self._max_batch_size_seen = max(self._max_batch_size_seen, len(batch))
+                self._total_batch_seconds += time.monotonic() - started
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Get queue depth and batching statistics.
+
+        Returns:
+            Dictionary of counters and averages
+        """
+        with self._metrics_lock:
+            return {
+                "model": self.model_name,
+                "queue_depth": self._queue.qsize(),
+                "requests": self._requests,
+                "batches": self._batches,
+                "avg_batch_size": (self._requests / self._batches) if self._batches else 0.0,
+                "last_batch_size": self._last_batch_size,
+                "max_batch_size": self._max_batch_size_seen,
+                "avg_batch_ms": (self._total_batch_seconds / self._batches * 1000) if self._batches else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop the batching thread after the queued requests are served.
+
+        The service is removed from the process-wide registry, so the next
+        get_embedding_service() call starts a fresh one, and later submits
+        to this instance fail instead of waiting forever.
+        """
+        with self._submit_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        with _services_lock:
+            if _services.get(self.model_name) is self:
+                del _services[self.model_name]
+        self._thread.join()
+
+
+_services: Dict[str, EmbeddingService] = {}
+_services_lock = threading.Lock()
+
+
+def get_embedding_service(model_name: str = "BAAI/bge-small-en-v1.5") -> EmbeddingService:
+    """
+    Get the process-wide embedding service for a model, creating it once.
+
+    Args:
+        model_name: Name of the fastembed model
+
+    Returns:
+        Shared EmbeddingService instance
+    """
+    with _services_lock:
+        service = _services.get(model_name)
+        if service is None:
+            service = EmbeddingService(model_name)
+            _services[model_name] = service
+        return service
@@ -0,0 +1,252 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize embedding rows so dot products are cosine similarities.
+
+    Args:
+        vectors: Matrix of shape (n, dim)
+
+    Returns:
+        float32 matrix with unit-length rows (zero rows are left as zeros)
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def top_k_neighbors(
+    queries: np.ndarray,
+    query_ids: np.ndarray,
+    corpus: np.ndarray,
+    corpus_ids: np.ndarray,
+    k: int,
+    chunk_size: int = 1024,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the top-k most similar corpus rows for every query row.
+
+    Similarities are computed with batched matrix multiplication over
+    normalized embeddings. Both queries and corpus are processed in blocks
+    of chunk_size rows, keeping a running top-k per query, so peak memory
+    is bounded by chunk_size * chunk_size similarities regardless of
+    catalog size. A query is never returned as its own neighbor.
+
+    Args:
+        queries: Normalized query vectors of shape (q, dim)
+        query_ids: Product IDs of the query rows
+        corpus: Normalized corpus vectors of shape (n, dim)
+        corpus_ids: Product IDs of the corpus rows
+        k: Number of neighbors to keep per query
+        chunk_size: Rows per block for queries and corpus
+
+    Returns:
+        Tuple of (neighbor_ids, scores), each of shape (q, k), sorted by
+        descending score and padded with -1 / -inf when fewer than k exist
+    """
+    num_queries = len(queries)
+    best_ids = np.full((num_queries, k), -1, dtype=np.int64)
+    best_scores = np.full((num_queries, k), -np.inf, dtype=np.float32)
+
+    for q_start in range(0, num_queries, chunk_size):
+        q_end = min(q_start + chunk_size, num_queries)
+        block_ids = best_ids[q_start:q_end]
+        block_scores = best_scores[q_start:q_end]
+        block_query_ids = query_ids[q_start:q_end, None]
+
+        for c_start in range(0, len(corpus), chunk_size):
+            c_end = min(c_start + chunk_size, len(corpus))
+            sims = queries[q_start:q_end] @ corpus[c_start:c_end].T
+            ids = np.broadcast_to(corpus_ids[c_start:c_end], sims.shape)
+            sims = np.where(ids == block_query_ids, -np.inf, sims)
+
+            merged_scores = np.concatenate([block_scores, sims], axis=1)
+            merged_ids = np.concatenate([block_ids, ids], axis=1)
+            keep = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+            block_scores = np.take_along_axis(merged_scores, keep, axis=1)
+            block_ids = np.take_along_axis(merged_ids, keep, axis=1)
+
+        order = np.argsort(-block_scores, axis=1, kind="stable")
+        block_scores = np.take_along_axis(block_scores, order, axis=1)
+        block_ids = np.take_along_axis(block_ids, order, axis=1)
+        block_ids[np.isneginf(block_scores)] = -1
+        best_ids[q_start:q_end] = block_ids
+        best_scores[q_start:q_end] = block_scores
+
+    return best_ids, best_scores
+
+
+class NeighborTable:
+    """
+    Precomputed item-to-item nearest neighbor table.
+
+    Stores the top-K most similar products for every product as two dense
+    (N, K) arrays of neighbor IDs and cosine scores, plus a product_id to
+    row index map, so "similar items" lookups are O(1) reads. The table is
+    built offline and refreshed incrementally when products change.
+    """
+
+    def __init__(self, product_ids: np.ndarray, neighbor_ids: np.ndarray, scores: np.ndarray):
+        """
+        Initialize the neighbor table from precomputed arrays.
+
+        Args:
+            product_ids: Product ID for each row, shape (n,)
+            neighbor_ids: Neighbor product IDs per row, shape (n, k)
+            scores: Similarity score per neighbor, shape (n, k)
+        """
+        self.product_ids = np.asarray(product_ids, dtype=np.int64)
+        self.neighbor_ids = np.asarray(neighbor_ids, dtype=np.int64)
+        self.scores = np.asarray(scores, dtype=np.float32)
+        self._rows: Dict[int, int] = {int(pid): row for row, pid in enumerate(self.product_ids)}
+
+    @property
+    def k(self) -> int:
+        """Number of neighbors stored per product."""
+        return self.neighbor_ids.shape[1]
+
+    @classmethod
+    def build(
+        cls,
+        product_ids: Iterable[int],
+        vectors: np.ndarray,
+        k: int = 20,
+        chunk_size: int = 1024,
+    ) -> "NeighborTable":
+        """
+        Build a neighbor table for the full catalog.
+
+        Args:
+            product_ids: Product ID for each vector row
+            vectors: Embedding matrix of shape (n, dim)
+            k: Number of neighbors to keep per product
+            chunk_size: Rows per block for the similarity computation
+
+        Returns:
+            A new NeighborTable
+        """
+        ids = np.asarray(list(product_ids), dtype=np.int64)
+        normalized = normalize_rows(vectors)
+        neighbor_ids, scores = top_k_neighbors(normalized, ids, normalized, ids, k, chunk_size)
+        return cls(ids, neighbor_ids, scores)
+
+    def refresh(
+        self,
+        product_ids: Iterable[int],
+        vectors: np.ndarray,
+        changed_ids: Iterable[int],
+        chunk_size: int = 1024,
+    ) -> "NeighborTable":
+        """
+        Refresh the table after some products were added, changed or removed.
+
+        Only neighborhoods that can be affected are recomputed:
+        changed products and products whose stored neighbor list referenced
+        a changed or removed product get an exact top-K recomputation;
+        every other product merges its existing list with its similarity to
+        the changed products, which is exact because its stored list was the
+        top-K over products that did not change.
+
+        Args:
+            product_ids: Product ID for each vector row of the current catalog
+            vectors: Current embedding matrix of shape (n, dim)
+            changed_ids: Products whose embedding was added or changed
+            chunk_size: Rows per block for the similarity computation
+
+        Returns:
+            A new NeighborTable reflecting the current catalog
+        """
+        ids = np.asarray(list(product_ids), dtype=np.int64)
+        normalized = normalize_rows(vectors)
+        k = self.k
+
+        removed = np.setdiff1d(self.product_ids, ids)
+        changed = np.union1d(np.asarray(list(changed_ids), dtype=np.int64), np.setdiff1d(ids, self.product_ids))
+        changed = np.intersect1d(changed, ids)
+        stale = np.union1d(changed, removed)
+
+        neighbor_ids = np.full((len(ids), k), -1, dtype=np.int64)
+        scores = np.full((len(ids), k), -np.inf, dtype=np.float32)
+
+        old_rows = np.array([self._rows.get(int(pid), -1) for pid in ids], dtype=np.int64)
+        has_old = old_rows >= 0
+        references_stale = np.zeros(len(ids), dtype=bool)
+        references_stale[has_old] = np.isin(self.neighbor_ids[old_rows[has_old]], stale).any(axis=1)
+
+        recompute = ~has_old | np.isin(ids, changed) | references_stale
+        merge = ~recompute
+
+        if recompute.any():
+            neighbor_ids[recompute], scores[recompute] = top_k_neighbors(
+                normalized[recompute], ids[recompute], normalized, ids, k, chunk_size
+            )
+
+        if merge.any():
+            merged_ids = self.neighbor_ids[old_rows[merge]]
+            merged_scores = self.scores[old_rows[merge]]
+            if len(changed):
+                changed_mask = np.isin(ids, changed)
+                new_ids, new_scores = top_k_neighbors(
+                    normalized[merge], ids[merge], normalized[changed_mask], ids[changed_mask], k, chunk_size
+                )
+                merged_ids = np.concatenate([merged_ids, new_ids], axis=1)
+                merged_scores = np.concatenate([merged_scores, new_scores], axis=1)
+                order = np.argsort(-merged_scores, axis=1, kind="stable")[:, :k]
+                merged_ids = np.take_along_axis(merged_ids, order, axis=1)
+                merged_scores = np.take_along_axis(merged_scores, order, axis=1)
+            neighbor_ids[merge], scores[merge] = merged_ids, merged_scores
+
+        return NeighborTable(ids, neighbor_ids, scores)
+
+    def get(self, product_id: int, limit: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Get the precomputed neighbors of a product.
+
+        Args:
+            product_id: ID of the reference product
+            limit: Maximum number of neighbors to return, defaults to all stored
+
+        Returns:
+            List of (product_id, similarity) tuples, most similar first
+        """
+        row = self._rows.get(int(product_id))
+        if row is None:
+            return []
+        limit = self.k if limit is None else min(limit, self.k)
+        return [
+            (int(pid), float(score))
+            for pid, score in zip(self.neighbor_ids[row, :limit], self.scores[row, :limit])
+            if pid >= 0
+        ]
+
+    def save(self, path: str) -> None:
+        """
+        Persist the table as an .npz file.
+
+        Args:
+            path: Destination file path
+        """
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, product_ids=self.product_ids, neighbor_ids=self.neighbor_ids, scores=self.scores)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["NeighborTable"]:
+        """
+        Load a table previously written by save().
+
+        Args:
+            path: Path to the .npz file
+
+        Returns:
+            The loaded NeighborTable, or None if the file does not exist
+        """
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return cls(data["product_ids"], data["neighbor_ids"], data["scores"])
@@ -0,0 +1,374 @@
+import contextlib
+import fcntl
+import json
+import os
+import shutil
+import uuid
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from claudecart.database.neighbor_table import normalize_rows
+
+
+class QuantizedIndex:
+    """
+    Quantized embedding index with full-precision rescoring.
+
+    Embeddings are kept in memory only as compact codes: int8 scalar
+    quantization (4x smaller than float32) or sign-binarized bits (32x
+    smaller). The normalized float32 vectors live in a memory-mapped file
+    on disk. Search is two-phase: a cheap scan over the codes selects
+    candidates, then only those candidates are read from the memory map
+    and rescored exactly.
+
+    The saving is in memory and scan time, not disk: the vector store keeps
+    its own float32 vectors and this index adds the codes plus a second
+    float32 copy in vectors.f32.
+
+    Each build is written to a fresh version directory and published by
+    atomically replacing a small pointer file, so a running process that
+    has the previous vectors memory-mapped keeps reading a consistent,
+    untouched copy.
+    """
+
+    MODES = ("int8", "binary")
+    POINTER_FILE = "current.json"
+    LOCK_FILE = "current.lock"
+    META_FILE = "quantized_meta.json"
+    CODES_FILE = "quantized_codes.npz"
+    VECTORS_FILE = "vectors.f32"
+
+    def __init__(
+        self,
+        path: str,
+        mode: str,
+        product_ids: np.ndarray,
+        codes: np.ndarray,
+        scales: Optional[np.ndarray],
+        dim: int,
+        stale: bool = False,
+    ):
+        """
+        Initialize the index from prebuilt codes.
+
+        Use QuantizedIndex.build() or QuantizedIndex.load() instead of
+        calling this directly.
+
+        Args:
+            path: Version directory holding the index files
+            mode: Quantization mode, "int8" or "binary"
+            product_ids: Product ID for each row
+            codes: Quantized codes, (n, dim) int8 or (n, dim / 8) uint8
+            scales: Per-dimension int8 scales, None for binary mode
+            dim: Embedding dimensionality
+            stale: Whether products were indexed after this build
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.product_ids = np.asarray(product_ids, dtype=np.int64)
+        self.codes = codes
+        self.scales = scales
+        self.dim = dim
+        self.stale = stale
+        self.vectors = np.memmap(
+            os.path.join(path, self.VECTORS_FILE),
+            dtype=np.float32,
+            mode="r",
+            shape=(len(self.product_ids), dim),
+        ) if len(self.product_ids) else np.empty((0, dim), dtype=np.float32)
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        product_ids: Iterable[int],
+        vectors: np.ndarray,
+        mode: str = "int8",
+    ) -> "QuantizedIndex":
+        """
+        Quantize a set of embeddings and publish them as the current index.
+
+        The files go to a new version directory under path; the pointer
+        file is switched to it atomically and older versions are removed
+        (processes still mapping them keep their open copy).
+
+        Args:
+            path: Index directory
+            product_ids: Product ID for each vector row
+            vectors: Embedding matrix of shape (n, dim)
+            mode: Quantization mode, "int8" or "binary"
+
+        Returns:
+            The newly built QuantizedIndex
+        """
+        if mode not in cls.MODES:
+            raise ValueError(f"Unknown quantization mode: {mode}")
+
+        version = f"v-{uuid.uuid4().hex[:12]}"
+        version_path = os.path.join(path, version)
+        os.makedirs(version_path)
+        ids = np.asarray(list(product_ids), dtype=np.int64)
+        normalized = normalize_rows(vectors)
+        dim = normalized.shape[1]
+
+        vectors_path = os.path.join(version_path, cls.VECTORS_FILE)
+        if len(ids):
+            full = np.memmap(vectors_path, dtype=np.float32, mode="w+", shape=normalized.shape)
+            full[:] = normalized
+            full.flush()
+            del full
+
+        scales = None
+        if mode == "int8":
+            scales = np.abs(normalized).max(axis=0) / 127.0 if len(ids) else np.ones(dim, dtype=np.float32)
+            scales[scales == 0] = 1.0
+            codes = np.clip(np.rint(normalized / scales), -127, 127).astype(np.int8)
+        else:
+            codes = cls._pack_bits(normalized)
+
+        arrays = {"product_ids": ids, "codes": codes}
+        if scales is not None:
+            arrays["scales"] = scales.astype(np.float32)
+        np.savez(os.path.join(version_path, cls.CODES_FILE), **arrays)
+        with open(os.path.join(version_path, cls.META_FILE), "w") as f:
+            json.dump({"mode": mode, "dim": dim, "count": len(ids)}, f)
+
+        with cls._pointer_lock(path):
+            cls._write_pointer(path, {"version": version, "stale": False})
+            for entry in os.listdir(path):
+                if entry.startswith("v-") and entry != version:
+                    shutil.rmtree(os.path.join(path, entry), ignore_errors=True)
+
+        return cls(version_path, mode, ids, codes, arrays.get("scales"), dim)
+
+    @staticmethod
+    def _pack_bits(vectors: np.ndarray) -> np.ndarray:
+        """Sign-binarize rows into bytes, padded to whole 64-bit words."""
+        packed = np.packbits(vectors > 0, axis=-1)
+        padding = -packed.shape[-1] % 8
+        if padding:
+            packed = np.pad(packed, [(0, 0)] * (packed.ndim - 1) + [(0, padding)])
+        return packed
+
+    @classmethod
+    @contextlib.contextmanager
+    def _pointer_lock(cls, path: str) -> Iterator[None]:
+        """Serialize pointer updates across processes with an flock."""
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, cls.LOCK_FILE), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    @classmethod
+    def _read_pointer(cls, path: str) -> Optional[Dict[str, Any]]:
+        """Read the pointer file naming the current version, if any."""
+        try:
+            with open(os.path.join(path, cls.POINTER_FILE), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def _write_pointer(cls, path: str, pointer: Dict[str, Any]) -> None:
+        """Replace the pointer file atomically."""
+        pointer_path = os.path.join(path, cls.POINTER_FILE)
+        tmp_path = f"{pointer_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(pointer, f)
+        os.replace(tmp_path, pointer_path)
+
+    @classmethod
+    def signature(cls, path: str) -> Optional[int]:
+        """
+        Cheap change marker for the index at path.
+
+        Args:
+            path: Index directory
+
+        Returns:
+            Modification time of the pointer file, or None without an index
+        """
+        try:
+            return os.stat(os.path.join(path, cls.POINTER_FILE)).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    @classmethod
+    def mark_stale(cls, path: str) -> None:
+        """
+        Flag the current index as out of date with the vector store.
+
+        Args:
+            path: Index directory; nothing happens if it holds no index
+        """
+        if cls._read_pointer(path) is None:
+            return
+        # Re-read under the lock so a concurrent build is never overwritten
+        with cls._pointer_lock(path):
+            pointer = cls._read_pointer(path)
+            if pointer is not None and not pointer.get("stale"):
+                cls._write_pointer(path, {**pointer, "stale": True})
+
+    @classmethod
+    def load(cls, path: str) -> Optional["QuantizedIndex"]:
+        """
+        Load an index previously written by build().
+
+        Args:
+            path: Index directory
+
+        Returns:
+            The current QuantizedIndex, or None if no index exists at path
+            or its version was removed by a concurrent build (callers fall
+            back to exact search and reload on the next signature change)
+        """
+        pointer = cls._read_pointer(path)
+        if pointer is None:
+            return None
+
+        version_path = os.path.join(path, pointer["version"])
+        try:
+            with open(os.path.join(version_path, cls.META_FILE), "r") as f:
+                meta = json.load(f)
+            with np.load(os.path.join(version_path, cls.CODES_FILE)) as data:
+                scales = data["scales"] if "scales" in data else None
+                return cls(
+                    version_path, meta["mode"], data["product_ids"], data["codes"], scales, meta["dim"],
+                    stale=bool(pointer.get("stale")),
+                )
+        except FileNotFoundError:
+            return None
+
+    def _coarse_scores(self, query: np.ndarray, chunk_size: int = 512) -> np.ndarray:
+        """
+        Score every row against the query using only the quantized codes.
+
+        int8 codes are widened into a small, cache-resident float32 buffer
+        and scored with BLAS one block at a time; numpy has no integer
+        BLAS, so integer accumulation is slower than this. Binary codes are
+        compared 64 bits at a time with XOR and popcount.
+
+        Args:
+            query: Normalized float32 query vector
+            chunk_size: int8 rows widened per block
+
+        Returns:
+            Approximate similarity per row (higher is more similar)
+        """
+        if self.mode == "binary":
+            words = self.codes.view(np.uint64)
+            packed_query = self._pack_bits(query[None, :]).view(np.uint64)[0]
+            hamming = np.bitwise_count(np.bitwise_xor(words, packed_query)).sum(axis=1, dtype=np.int32)
+            return -hamming.astype(np.float32)
+
+        scores = np.empty(len(self.codes), dtype=np.float32)
+        scaled_query = (query * self.scales).astype(np.float32)
+        buffer = np.empty((min(chunk_size, len(self.codes)), self.dim), dtype=np.float32)
+        for start in range(0, len(self.codes), chunk_size):
+            block = self.codes[start:start + chunk_size]
+            widened = buffer[:len(block)]
+            np.copyto(widened, block, casting="unsafe")
+            np.dot(widened, scaled_query, out=scores[start:start + len(block)])
+        return scores
+
+    def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        rescore_candidates: Optional[int] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Two-phase search: quantized scan, then exact float32 rescoring.
+
+        Args:
+            query_vector: Query embedding
+            limit: Number of results to return
+            rescore_candidates: Candidates kept from the coarse scan for
+                exact rescoring, defaults to 10x limit (40x for binary)
+
+        Returns:
+            List of (product_id, cosine similarity) tuples, best first
+        """
+        if len(self.product_ids) == 0:
+            return []
+
+        query = normalize_rows(np.asarray(query_vector, dtype=np.float32)[None, :])[0]
+        if rescore_candidates is None:
+            rescore_candidates = limit * (40 if self.mode == "binary" else 10)
+        candidates = min(max(rescore_candidates, limit), len(self.product_ids))
+
+        coarse = self._coarse_scores(query)
+        candidate_rows = np.argpartition(-coarse, candidates - 1)[:candidates]
+        candidate_rows.sort()  # sequential reads from the memory map
+
+        exact = self.vectors[candidate_rows] @ query
+        order = np.argsort(-exact)[:limit]
+        return [(int(self.product_ids[candidate_rows[i]]), float(exact[i])) for i in order]
+
+    def exact_search(self, query_vector: List[float], limit: int = 5) -> List[Tuple[int, float]]:
+        """
+        Brute-force float32 search over every vector, the recall baseline.
+
+        Args:
+            query_vector: Query embedding
+            limit: Number of results to return
+
+        Returns:
+            List of (product_id, cosine similarity) tuples, best first
+        """
+        if len(self.product_ids) == 0:
+            return []
+
+        query = normalize_rows(np.asarray(query_vector, dtype=np.float32)[None, :])[0]
+        scores = np.asarray(self.vectors @ query)
+        order = np.argsort(-scores)[:limit]
+        return [(int(self.product_ids[i]), float(scores[i])) for i in order]
+
+    def recall_at_k(
+        self,
+        query_vectors: np.ndarray,
+        k: int = 10,
+        rescore_candidates: Optional[int] = None,
+    ) -> float:
+        """
+        Measure recall of the two-phase search against the exact baseline.
+
+        Args:
+            query_vectors: Matrix of query embeddings, shape (q, dim)
+            k: Number of results compared per query
+            rescore_candidates: Candidates passed through to search()
+
+        Returns:
+            Mean fraction of the exact top-k found by the quantized search
+        """
+        recalls = []
+        for query in np.asarray(query_vectors, dtype=np.float32):
+            exact = {pid for pid, _ in self.exact_search(query, k)}
+            if not exact:
+                continue
+            approx = {pid for pid, _ in self.search(query, k, rescore_candidates)}
+            recalls.append(len(exact & approx) / len(exact))
+        return float(np.mean(recalls)) if recalls else 0.0
+
+    def memory_footprint(self) -> Dict[str, Any]:
+        """
+        Compare the in-memory code size with full float32 storage.
+
+        Returns:
+            Dictionary with code bytes, float32 bytes and compression ratio
+        """
+        code_bytes = int(self.codes.nbytes)
+        float_bytes = len(self.product_ids) * self.dim * 4
+        return {
+            "mode": self.mode,
+            "code_bytes": code_bytes,
+            "float32_bytes": float_bytes,
+            "compression": (float_bytes / code_bytes) if code_bytes else 0.0,
+        }
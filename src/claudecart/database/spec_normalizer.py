@@ -0,0 +1,146 @@
+import re
+from typing import Dict, Optional, Tuple
+
+
+# Unit aliases mapped to (canonical unit, factor to convert into it)
+UNIT_CONVERSIONS: Dict[str, Tuple[str, float]] = {
+    # Weight, canonical pounds
+    "lb": ("lb", 1.0), "lbs": ("lb", 1.0), "pound": ("lb", 1.0), "pounds": ("lb", 1.0),
+    "oz": ("lb", 1.0 / 16), "ounce": ("lb", 1.0 / 16), "ounces": ("lb", 1.0 / 16),
+    "g": ("lb", 0.00220462), "gram": ("lb", 0.00220462), "grams": ("lb", 0.00220462),
+    "kg": ("lb", 2.20462), "kgs": ("lb", 2.20462),
+    # Data size, canonical gigabytes
+    "mb": ("GB", 1.0 / 1024), "gb": ("GB", 1.0), "tb": ("GB", 1024.0),
+    # Length, canonical inches
+    "in": ("in", 1.0), "inch": ("in", 1.0), "inches": ("in", 1.0), '"': ("in", 1.0),
+    "ft": ("in", 12.0), "feet": ("in", 12.0), "foot": ("in", 12.0),
+    "mm": ("in", 0.0393701), "cm": ("in", 0.393701),
+    # Volume, canonical liters
+    "l": ("L", 1.0), "liter": ("L", 1.0), "liters": ("L", 1.0), "ml": ("L", 0.001),
+    "quart": ("L", 0.946353), "quarts": ("L", 0.946353), "qt": ("L", 0.946353),
+    "fl": ("L", 0.0295735),  # "fl oz"
+    # Time, canonical hours
+    "hour": ("hours", 1.0), "hours": ("hours", 1.0), "hr": ("hours", 1.0), "hrs": ("hours", 1.0),
+    "minute": ("hours", 1.0 / 60), "minutes": ("hours", 1.0 / 60), "min": ("hours", 1.0 / 60),
+    "year": ("years", 1.0), "years": ("years", 1.0),
+    # Electrical and other
+    "mah": ("mAh", 1.0), "wh": ("Wh", 1.0),
+    "w": ("W", 1.0), "watt": ("W", 1.0), "watts": ("W", 1.0), "kw": ("W", 1000.0),
+    "hp": ("hp", 1.0),
+    "hz": ("Hz", 1.0), "khz": ("Hz", 1000.0), "mhz": ("Hz", 1e6), "ghz": ("Hz", 1e9),
+    "mp": ("MP", 1.0),
+    "%": ("%", 1.0),
+}
+
+# Ounces of a container are fluid ounces, not weight
+FLUID_OUNCE_UNITS = {"oz", "ounce", "ounces"}
+VOLUME_SPEC_WORDS = {"capacity", "container", "volume", "bowl", "jar", "pitcher", "tank", "reservoir", "bottle"}
+
+# A number, with optional thousands separators: "12", "2.5", "10,000", "1,500.5"
+_NUMBER = r"(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?"
+_NUMBER_UNIT = re.compile(rf"({_NUMBER})\s*-?\s*(%|\"|[A-Za-z]+)?")
+# "4.5-9 hours" or "2 to 4 people", but not model numbers like "i5-1235U"
+_RANGE = re.compile(rf"(?<![\w.,])({_NUMBER})\s*(?:-|–|to)\s*{_NUMBER}(?![\d.,])")
+# "in" is inches only at the end or before punctuation or "x 5" ("15.6 in", "13 in x 9 in"),
+# not in "3-in-1" or "Wi-Fi 6 in all rooms"
+_INCH_FOLLOWER = re.compile(r"\s*(?:$|[^\w\s-]|x\s*\d)")
+
+
+def canonical_spec_name(name: str) -> str:
+    """
+    Normalize a specification name for lookups.
+
+    Args:
+        name: Raw specification name, e.g. "Screen Size"
+
+    Returns:
+        Lower-case, underscore-separated name, e.g. "screen_size"
+    """
+    return re.sub(r"[\s\-]+", "_", name.strip().lower())
+
+
+def _is_volume_spec(spec_name: Optional[str]) -> bool:
+    """Whether a specification measures a volume, e.g. "Container" or "Bowl Capacity"."""
+    if not spec_name:
+        return False
+    return bool(VOLUME_SPEC_WORDS & set(canonical_spec_name(spec_name).split("_")))
+
+
+def to_canonical(
+    value: float,
+    unit: Optional[str],
+    spec_name: Optional[str] = None,
+) -> Tuple[float, Optional[str]]:
+    """
+    Convert a number in a given unit to the unit's canonical form.
+
+    Args:
+        value: Numeric value
+        unit: Unit alias such as "pounds", "oz" or "TB"; None for unitless
+        spec_name: Specification the value belongs to; ounces of volume
+            specifications (capacity, container, ...) are fluid ounces
+
+    Returns:
+        Tuple of (converted value, canonical unit); unknown units are
+        returned unchanged
+    """
+    if unit is None:
+        return value, None
+    if unit.lower() in FLUID_OUNCE_UNITS and _is_volume_spec(spec_name):
+        unit = "fl"
+    conversion = UNIT_CONVERSIONS.get(unit.lower())
+    if conversion is None:
+        return value, unit
+    canonical_unit, factor = conversion
+    return value * factor, canonical_unit
+
+
+def parse_spec_value(value: str, spec_name: Optional[str] = None) -> Tuple[Optional[float], Optional[str]]:
+    """
+    Parse a free-text specification value into a number and canonical unit.
+
+    The first number followed by a known unit wins ("Up to 23 hours video"
+    -> 23 hours, "13.43 x 12.4 x 12.4 inches" -> 13.43 in). Thousands
+    separators are accepted ("10,000mAh" -> 10000 mAh), and "in" only
+    counts as inches when no word follows it. Ranges keep
+    their lower bound ("4.5-9 hours" -> 4.5 hours), so a minimum filter
+    only matches values the product always meets. Values that start with
+    a number but carry no known unit are stored unitless ("10 speeds" ->
+    10). Anything else has no numeric value.
+
+    Args:
+        value: Raw specification value, e.g. "2.59 pounds" or "256GB SSD"
+        spec_name: Specification name, used to tell fluid from weight ounces
+
+    Returns:
+        Tuple of (numeric value in canonical unit, canonical unit), either
+        of which may be None
+    """
+    value = _RANGE.sub(r"\1", value)
+    matches = list(_NUMBER_UNIT.finditer(value))
+    if not matches:
+        return None, None
+
+    for match in matches:
+        unit = match.group(2)
+        if not unit or unit.lower() not in UNIT_CONVERSIONS:
+            continue
+        if unit.lower() == "in" and not _INCH_FOLLOWER.match(value, match.end()):
+            continue
+        # In "A x B x C unit" the unit applies to every number; keep the first
+        number = matches[0].group(1) if _is_dimension(value) else match.group(1)
+        return to_canonical(_to_float(number), unit, spec_name)
+
+    if value.lstrip()[:1].isdigit():
+        return _to_float(matches[0].group(1)), None
+    return None, None
+
+
+def _to_float(number: str) -> float:
+    """Convert a matched number, dropping thousands separators."""
+    return float(number.replace(",", ""))
+
+
+def _is_dimension(value: str) -> bool:
+    """Whether a value looks like "A x B x C unit"."""
+    return bool(re.search(r"\d\s*x\s*\d", value))
@@ -2,7 +2,27 @@ import json
 import os
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
+
+from claudecart.database.spec_normalizer import canonical_spec_name, parse_spec_value, to_canonical
+from claudecart.utils.catalog_loader import load_catalog_file
+
+
+# Upper bounds of the materialized price buckets; the last bucket is open-ended
+PRICE_BUCKET_BOUNDS = [25, 50, 100, 250, 500, 1000, 2500]
+
+
+def _price_bucket_sql(column: str) -> str:
+    """SQL expression mapping a price column to its bucket index."""
+    cases = " ".join(
+        f"WHEN {column} < {bound} THEN {index}" for index, bound in enumerate(PRICE_BUCKET_BOUNDS)
+    )
+    return f"CASE WHEN {column} IS NULL THEN -1 {cases} ELSE {len(PRICE_BUCKET_BOUNDS)} END"
+
+
+def _rating_bucket_sql(column: str) -> str:
+    """SQL expression mapping a rating column to its whole-star bucket."""
+    return f"CASE WHEN {column} IS NULL THEN -1 ELSE CAST({column} AS INTEGER) END"
 
 
 class SQLiteManager:
@@ -73,8 +93,184 @@ class SQLiteManager:
         )
         ''')
         
+        # Child-table lookups by product (also used when reloading products)
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_product_features_product
+        ON product_features(product_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_product_specifications_product
+        ON product_specifications(product_id)
+        ''')
+        
+        # Typed specification attributes parsed from product_specifications
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS spec_names (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS product_spec_attributes (
+            product_id INTEGER NOT NULL,
+            name_id INTEGER NOT NULL,
+            num_value REAL,
+            unit TEXT,
+            text_value TEXT,
+            PRIMARY KEY (product_id, name_id),
+            FOREIGN KEY (product_id) REFERENCES products(id),
+            FOREIGN KEY (name_id) REFERENCES spec_names(id)
+        ) WITHOUT ROWID
+        ''')
+        
+        # Range filters seek on (name, unit, value) and read product_id from the index
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_spec_attributes_numeric
+        ON product_spec_attributes(name_id, unit, num_value, product_id)
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_spec_attributes_text
+        ON product_spec_attributes(name_id, text_value, product_id)
+        ''')
+        
+        self._ensure_facets(cursor)
+        
+        # Competitor price observations written by the price-audit job
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS price_history (
+            id INTEGER PRIMARY KEY,
+            audit_run_id TEXT NOT NULL,
+            product_id INTEGER NOT NULL,
+            sku TEXT,
+            competitor TEXT NOT NULL,
+            competitor_price REAL,
+            our_price REAL,
+            price_match_eligible INTEGER,
+            recommendation TEXT,
+            observed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (audit_run_id, product_id, competitor),
+            FOREIGN KEY (product_id) REFERENCES products(id)
+        )
+        ''')
+        cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_price_history_product
+        ON price_history(product_id, observed_at)
+        ''')
+        
         conn.commit()
         conn.close()
+    
+    @staticmethod
+    def _ensure_facets(cursor: sqlite3.Cursor) -> None:
+        """
+        Create the materialized facet tables and the triggers that maintain them.
+        
+        facet_counts holds product counts per (category, brand, price bucket)
+        and rating_histogram per (category, brand, rating bucket). Triggers on
+        products keep both current on insert, update and delete, so reading
+        facets never scans products. Tables are backfilled when first created.
+        
+        Args:
+            cursor: Cursor on the connection creating the schema
+        """
+        existing = cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'facet_counts'"
+        ).fetchone()
+        
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS facet_counts (
+            category TEXT NOT NULL,
+            brand TEXT NOT NULL,
+            price_bucket INTEGER NOT NULL,
+            product_count INTEGER NOT NULL,
+            PRIMARY KEY (category, brand, price_bucket)
+        ) WITHOUT ROWID
+        ''')
+        cursor.execute('''
+        CREATE TABLE IF NOT EXISTS rating_histogram (
+            category TEXT NOT NULL,
+            brand TEXT NOT NULL,
+            rating_bucket INTEGER NOT NULL,
+            product_count INTEGER NOT NULL,
+            PRIMARY KEY (category, brand, rating_bucket)
+        ) WITHOUT ROWID
+        ''')
+        
+        facets = {
+            "facet_counts": ("price_bucket", _price_bucket_sql),
+            "rating_histogram": ("rating_bucket", _rating_bucket_sql),
+        }
+        
+        def add(table: str, row: str) -> str:
+            bucket_column, bucket_sql = facets[table]
+            column = "price" if table == "facet_counts" else "rating"
+            return f'''
+            INSERT INTO {table} (category, brand, {bucket_column}, product_count)
+            VALUES (COALESCE({row}.category, ''), COALESCE({row}.brand, ''), {bucket_sql(f"{row}.{column}")}, 1)
+            ON CONFLICT (category, brand, {bucket_column}) DO UPDATE SET product_count = product_count + 1;
+            '''
+        
+        def remove(table: str, row: str) -> str:
+            bucket_column, bucket_sql = facets[table]
+            column = "price" if table == "facet_counts" else "rating"
+            key = (
+                f"category = COALESCE({row}.category, '') AND brand = COALESCE({row}.brand, '') "
+                f"AND {bucket_column} = {bucket_sql(f'{row}.{column}')}"
+            )
+            return f'''
+            UPDATE {table} SET product_count = product_count - 1 WHERE {key};
+            DELETE FROM {table} WHERE {key} AND product_count <= 0;
+            '''
+        
+        tables = list(facets)
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_facets_insert AFTER INSERT ON products
+        BEGIN {"".join(add(table, "NEW") for table in tables)} END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_facets_delete AFTER DELETE ON products
+        BEGIN {"".join(remove(table, "OLD") for table in tables)} END
+        ''')
+        cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_products_facets_update
+        AFTER UPDATE OF category, brand, price, rating ON products
+        BEGIN
+            {"".join(remove(table, "OLD") for table in tables)}
+            {"".join(add(table, "NEW") for table in tables)}
+        END
+        ''')
+        
+        if existing is None:
+            SQLiteManager._rebuild_facets(cursor)
+    
+    @staticmethod
+    def _rebuild_facets(cursor: sqlite3.Cursor) -> None:
+        """Recompute both facet tables from products with one GROUP BY each."""
+        cursor.execute("DELETE FROM facet_counts")
+        cursor.execute("DELETE FROM rating_histogram")
+        cursor.execute(f'''
+        INSERT INTO facet_counts (category, brand, price_bucket, product_count)
+        SELECT COALESCE(category, ''), COALESCE(brand, ''), {_price_bucket_sql("price")}, COUNT(*)
+        FROM products GROUP BY 1, 2, 3
+        ''')
+        cursor.execute(f'''
+        INSERT INTO rating_histogram (category, brand, rating_bucket, product_count)
+        SELECT COALESCE(category, ''), COALESCE(brand, ''), {_rating_bucket_sql("rating")}, COUNT(*)
+        FROM products GROUP BY 1, 2, 3
+        ''')
+    
+    def rebuild_facets(self) -> None:
+        """
+        Recompute the materialized facet tables from scratch.
+        
+        Only needed if products were modified with triggers disabled.
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                self._rebuild_facets(conn.cursor())
+        finally:
+            conn.close()
         
     def load_seed_data(self, seed_files: List[str]) -> None:
         """
@@ -83,8 +279,334 @@ class SQLiteManager:
         Args:
             seed_files: List of paths to JSON seed data files
         """
-        # Function to be implemented
-        pass
+        for seed_file in seed_files:
+            self.bulk_load_products(load_catalog_file(seed_file))
+        
+    def bulk_load_products(self, products: List[Dict[str, Any]]) -> int:
+        """
+        Insert or replace a batch of products in a single transaction.
+        
+        Products, features and specifications are written with executemany
+        inside one transaction (WAL journal, relaxed fsync), which is much
+        faster than per-row commits. Existing rows for the same product IDs
+        are replaced, so reloading a batch is idempotent.
+        
+        Args:
+            products: Product dictionaries as found in the catalog files
+        
+        Returns:
+            Number of products written
+        """
+        if not products:
+            return 0
+        
+        product_rows = [
+            (
+                p["id"], p["name"], p.get("brand"), p.get("category"), p.get("price"),
+                p.get("sku"), p.get("description"), p.get("rating"), p.get("review_count"),
+            )
+            for p in products
+        ]
+        id_rows = [(p["id"],) for p in products]
+        feature_rows = [
+            (p["id"], feature)
+            for p in products
+            for feature in p.get("features", [])
+        ]
+        spec_rows = [
+            (p["id"], name, str(value))
+            for p in products
+            for name, value in p.get("specifications", {}).items()
+        ]
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executemany("DELETE FROM product_features WHERE product_id = ?", id_rows)
+                conn.executemany("DELETE FROM product_specifications WHERE product_id = ?", id_rows)
+                # Upsert rather than REPLACE so the facet triggers see an UPDATE
+                conn.executemany('''
+                INSERT INTO products
+                    (id, name, brand, category, price, sku, description, rating, review_count)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (id) DO UPDATE SET
+                    name = excluded.name, brand = excluded.brand, category = excluded.category,
+                    price = excluded.price, sku = excluded.sku, description = excluded.description,
+                    rating = excluded.rating, review_count = excluded.review_count,
+                    updated_at = CURRENT_TIMESTAMP
+                ''', product_rows)
+                conn.executemany(
+                    "INSERT INTO product_features (product_id, feature) VALUES (?, ?)",
+                    feature_rows,
+                )
+                conn.executemany(
+                    "INSERT INTO product_specifications (product_id, spec_name, spec_value) VALUES (?, ?, ?)",
+                    spec_rows,
+                )
+                self._normalize_specifications(conn, [row[0] for row in id_rows])
+        finally:
+            conn.close()
+        
+        return len(products)
+    
+    def normalize_specifications(self, product_ids: Optional[List[int]] = None) -> int:
+        """
+        Rebuild typed specification attributes from product_specifications.
+        
+        Bulk loads run this automatically for the products they write; call
+        it directly after editing product_specifications by other means.
+        
+        Args:
+            product_ids: Products to normalize, defaults to every product
+        
+        Returns:
+            Number of attribute rows written
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                return self._normalize_specifications(conn, product_ids)
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _normalize_specifications(conn: sqlite3.Connection, product_ids: Optional[List[int]]) -> int:
+        """
+        Parse spec values into canonical numeric/unit/text attributes.
+        
+        Runs inside the caller's transaction.
+        
+        Args:
+            conn: Open connection with an active transaction
+            product_ids: Products to normalize, or None for every product
+        
+        Returns:
+            Number of attribute rows written
+        """
+        if product_ids is None:
+            conn.execute("DELETE FROM product_spec_attributes")
+            rows = conn.execute(
+                "SELECT product_id, spec_name, spec_value FROM product_specifications"
+            ).fetchall()
+        else:
+            id_rows = [(product_id,) for product_id in product_ids]
+            conn.executemany("DELETE FROM product_spec_attributes WHERE product_id = ?", id_rows)
+            rows = []
+            for product_id, in id_rows:
+                rows.extend(conn.execute(
+                    "SELECT product_id, spec_name, spec_value FROM product_specifications WHERE product_id = ?",
+                    (product_id,),
+                ).fetchall())
+        
+        names = {canonical_spec_name(spec_name) for _, spec_name, _ in rows}
+        conn.executemany("INSERT OR IGNORE INTO spec_names (name) VALUES (?)", [(name,) for name in names])
+        name_ids = dict(conn.execute("SELECT name, id FROM spec_names").fetchall())
+        
+        attribute_rows = []
+        for product_id, spec_name, spec_value in rows:
+            num_value, unit = parse_spec_value(spec_value or "", spec_name)
+            attribute_rows.append((
+                product_id, name_ids[canonical_spec_name(spec_name)],
+                num_value, unit, (spec_value or "").strip().lower(),
+            ))
+        conn.executemany('''
+        INSERT OR REPLACE INTO product_spec_attributes
+            (product_id, name_id, num_value, unit, text_value)
+        VALUES (?, ?, ?, ?, ?)
+        ''', attribute_rows)
+        return len(attribute_rows)
+    
+    def get_facets(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Get facet counts from the materialized facet tables.
+        
+        Reads only facet_counts and rating_histogram, whose size depends on
+        the number of categories, brands and buckets rather than products.
+        Price filters select whole buckets: a bucket is included when it
+        overlaps [min_price, max_price), so counts near a boundary are
+        bucket-granular. When a bound falls inside a bucket the result is
+        flagged "approximate", since its counts include products outside
+        the requested prices. Rating counts honor category and brand
+        filters only.
+        
+        Args:
+            filters: Optional category, brand, min_price and max_price
+            
+        Returns:
+            Dictionary with total count, an "approximate" flag, and
+            category, brand, price bucket and rating facets, each a list of
+            values with counts
+        """
+        filters = filters or {}
+        clauses = []
+        params: List[Any] = []
+        if filters.get("category"):
+            clauses.append("category = ? COLLATE NOCASE")
+            params.append(filters["category"])
+        if filters.get("brand"):
+            clauses.append("brand = ? COLLATE NOCASE")
+            params.append(filters["brand"])
+        rating_where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        rating_params = list(params)
+        
+        bounds = [0] + PRICE_BUCKET_BOUNDS + [None]
+        buckets = list(range(len(PRICE_BUCKET_BOUNDS) + 1))
+        if filters.get("min_price") is not None:
+            buckets = [b for b in buckets if bounds[b + 1] is None or bounds[b + 1] > filters["min_price"]]
+        if filters.get("max_price") is not None:
+            buckets = [b for b in buckets if bounds[b] < filters["max_price"]]
+        # Bounds that are bucket edges select exactly; anything else keeps a partial bucket
+        approximate = any(
+            filters.get(bound) is not None and filters[bound] not in bounds
+            for bound in ("min_price", "max_price")
+        )
+        if filters.get("min_price") is not None or filters.get("max_price") is not None:
+            clauses.append(f"price_bucket IN ({', '.join('?' * len(buckets))})" if buckets else "0")
+            params.extend(buckets)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            def grouped(column: str, table: str, table_where: str, table_params: List[Any]) -> List[Tuple]:
+                return conn.execute(
+                    f"SELECT {column}, SUM(product_count) FROM {table}{table_where} "
+                    f"GROUP BY {column} ORDER BY {column}",
+                    table_params,
+                ).fetchall()
+            
+            total = conn.execute(f"SELECT COALESCE(SUM(product_count), 0) FROM facet_counts{where}", params).fetchone()[0]
+            categories = grouped("category", "facet_counts", where, params)
+            brands = grouped("brand", "facet_counts", where, params)
+            prices = grouped("price_bucket", "facet_counts", where, params)
+            ratings = grouped("rating_bucket", "rating_histogram", rating_where, rating_params)
+        finally:
+            conn.close()
+        
+        return {
+            "total": total,
+            "approximate": approximate,
+            "categories": [{"value": value, "count": count} for value, count in categories if value],
+            "brands": [{"value": value, "count": count} for value, count in brands if value],
+            "price_buckets": [
+                {"min_price": bounds[bucket], "max_price": bounds[bucket + 1], "count": count}
+                for bucket, count in prices if bucket >= 0
+            ],
+            "ratings": [{"stars": bucket, "count": count} for bucket, count in ratings if bucket >= 0],
+        }
+    
+    def iter_product_batches(
+        self,
+        batch_size: int = 500,
+        after_id: int = 0,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Page through the products table in ID order.
+        
+        Uses keyset pagination (id > last seen id) on the primary key, so
+        each page is an index seek no matter how deep into the table the
+        job is, and a caller can resume from the last ID it finished.
+        
+        Args:
+            batch_size: Number of products per page
+            after_id: Only return products with a greater ID
+            limit: Maximum total number of products to return
+        
+        Yields:
+            Lists of product dictionaries (id, name, brand, category, price, sku)
+        """
+        remaining = limit
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            while remaining is None or remaining > 0:
+                page_size = batch_size if remaining is None else min(batch_size, remaining)
+                rows = conn.execute(
+                    "SELECT id, name, brand, category, price, sku FROM products "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (after_id, page_size),
+                ).fetchall()
+                if not rows:
+                    return
+                yield [dict(row) for row in rows]
+                after_id = rows[-1]["id"]
+                if remaining is not None:
+                    remaining -= len(rows)
+        finally:
+            conn.close()
+    
+    def get_products_by_ids(self, product_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Get the products with the given IDs.
+        
+        Args:
+            product_ids: Product IDs to look up
+        
+        Returns:
+            Product dictionaries (id, name, brand, category, price, sku) in ID
+            order; unknown IDs are skipped
+        """
+        if not product_ids:
+            return []
+        
+        placeholders = ", ".join("?" for _ in product_ids)
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            rows = conn.execute(
+                f"SELECT id, name, brand, category, price, sku FROM products WHERE id IN ({placeholders}) ORDER BY id",
+                list(product_ids),
+            ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+    
+    def record_price_history(self, observations: List[Dict[str, Any]]) -> int:
+        """
+        Write competitor price observations in a single transaction.
+        
+        Observations are keyed by (audit_run_id, product_id, competitor), so
+        writing the same audit results again replaces them instead of
+        adding duplicates.
+        
+        Args:
+            observations: Dictionaries with audit_run_id, product_id, sku,
+                competitor, competitor_price, our_price, price_match_eligible
+                and recommendation
+        
+        Returns:
+            Number of observations written
+        """
+        if not observations:
+            return 0
+        
+        rows = [
+            (
+                o["audit_run_id"], o["product_id"], o.get("sku"), o["competitor"],
+                o.get("competitor_price"), o.get("our_price"),
+                None if o.get("price_match_eligible") is None else int(bool(o["price_match_eligible"])),
+                o.get("recommendation"),
+            )
+            for o in observations
+        ]
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.executemany('''
+                INSERT OR REPLACE INTO price_history
+                    (audit_run_id, product_id, sku, competitor, competitor_price,
+                     our_price, price_match_eligible, recommendation)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', rows)
+        finally:
+            conn.close()
+        
+        return len(rows)
     
     def get_product_by_id(self, product_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -105,20 +627,90 @@ class SQLiteManager:
         category: Optional[str] = None,
         min_price: Optional[float] = None,
         max_price: Optional[float] = None,
-        brand: Optional[str] = None
+        brand: Optional[str] = None,
+        spec_filters: Optional[Dict[str, Dict[str, Any]]] = None,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
         Search for products based on criteria.
         
+        Spec filters are pushed down to SQL against the typed attribute
+        table, so each one is an index range scan on (name, unit, value).
+        Bounds are converted to the canonical unit of the given unit first,
+        e.g. {"weight": {"max": 3, "unit": "lbs"}, "memory": {"min": 16, "unit": "GB"}}.
+        A "min" or "max" bound needs a "unit" so bounds are never compared
+        across units; pass "unit": None for unitless values ("10 speeds").
+        
         Args:
             query: Search query string
             category: Filter by category
             min_price: Minimum price filter
             max_price: Maximum price filter
             brand: Filter by brand
-            
+            spec_filters: Mapping of spec name to {"min", "max", "unit", "equals"}
+            limit: Maximum number of results to return
+        
         Returns:
             List of matching product dictionaries
+        
+        Raises:
+            ValueError: If a spec filter has a "min" or "max" bound but no "unit"
         """
-        # Function to be implemented
-        pass
\ No newline at end of file
+        clauses = []
+        params: List[Any] = []
+        
+        for term in (query or "").split():
+            clauses.append("(p.name LIKE ? OR p.description LIKE ? OR p.brand LIKE ? OR p.category LIKE ?)")
+            params.extend([f"%{term}%"] * 4)
+        if category:
+            clauses.append("p.category = ? COLLATE NOCASE")
+            params.append(category)
+        if brand:
+            clauses.append("p.brand = ? COLLATE NOCASE")
+            params.append(brand)
+        if min_price is not None:
+            clauses.append("p.price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            clauses.append("p.price <= ?")
+            params.append(max_price)
+        
+        for spec_name, spec_filter in (spec_filters or {}).items():
+            spec_clauses = ["a.name_id = (SELECT id FROM spec_names WHERE name = ?)"]
+            spec_params: List[Any] = [canonical_spec_name(spec_name)]
+            unit = spec_filter.get("unit")
+            has_bounds = spec_filter.get("min") is not None or spec_filter.get("max") is not None
+            if has_bounds and "unit" not in spec_filter:
+                raise ValueError(f"Spec filter {spec_name!r} needs a unit for min/max (None for unitless values)")
+            if unit is not None:
+                spec_clauses.append("a.unit = ?")
+                spec_params.append(to_canonical(1.0, unit, spec_name)[1])
+            elif has_bounds:
+                spec_clauses.append("a.unit IS NULL")
+            if "equals" in spec_filter:
+                spec_clauses.append("a.text_value = ?")
+                spec_params.append(str(spec_filter["equals"]).strip().lower())
+            for bound, operator in (("min", ">="), ("max", "<=")):
+                if spec_filter.get(bound) is not None:
+                    spec_clauses.append(f"a.num_value {operator} ?")
+                    spec_params.append(to_canonical(float(spec_filter[bound]), unit, spec_name)[0])
+            clauses.append(
+                "p.id IN (SELECT a.product_id FROM product_spec_attributes a WHERE "
+                + " AND ".join(spec_clauses) + ")"
+            )
+            params.extend(spec_params)
+        
+        sql = "SELECT p.* FROM products p"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY p.rating DESC, p.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            return [dict(row) for row in conn.execute(sql, params).fetchall()]
+        finally:
+            conn.close()
\ No newline at end of file
@@ -1,8 +1,13 @@
+import fcntl
 import os
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterable, List, Any, Optional, Tuple, Union
 
 import lancedb
-from fastembed import TextEmbedding
+import numpy as np
+
+from claudecart.database.embedding_service import EmbeddingService, get_embedding_service
+from claudecart.database.neighbor_table import NeighborTable
+from claudecart.database.quantized_index import QuantizedIndex
 
 
 class VectorManager:
@@ -14,10 +19,19 @@ class VectorManager:
     recommendation capabilities.
     """
     
+    TABLE_NAME = "products"
+    NEIGHBOR_FILE = "neighbors.npz"
+    CHANGED_FILE = "neighbors.changed.log"
+    QUANTIZED_DIR = "quantized"
+    FILTER_COLUMNS = ("id", "name", "brand", "category", "price")
+    EMBED_TIMEOUT = 30.0
+    
     def __init__(
         self, 
         db_path: str = "vectorstore", 
-        embedding_model: str = "BAAI/bge-small-en-v1.5"
+        embedding_model: str = "BAAI/bge-small-en-v1.5",
+        neighbor_k: int = 20,
+        quantization: Optional[str] = None,
     ):
         """
         Initialize the vector database manager.
@@ -25,16 +39,44 @@ class VectorManager:
         Args:
             db_path: Path to the vector database directory
             embedding_model: Name of the embedding model to use
+            neighbor_k: Number of precomputed neighbors kept per product
+            quantization: Optional "int8" or "binary" quantized search index
         """
         self.db_path = db_path
         self._ensure_db_exists()
         
-        # Initialize embedding model
-        self.embedding_model = TextEmbedding(embedding_model)
+        # Shared, micro-batching embedding service, loaded on first use so
+        # writers that bring their own vectors never load the model
+        self.embedding_model_name = embedding_model
         
         # Connect to LanceDB
         self.db = lancedb.connect(self.db_path)
         
+        # Precomputed item-to-item neighbors for get_similar_products
+        self.neighbor_k = neighbor_k
+        self.neighbor_path = os.path.join(self.db_path, self.NEIGHBOR_FILE)
+        self.neighbor_table = NeighborTable.load(self.neighbor_path)
+        self._neighbor_signature = self._file_signature(self.neighbor_path)
+        # Append-only log of products indexed since the last refresh, shared
+        # with other processes under an flock and kept across restarts
+        self.changed_path = os.path.join(self.db_path, self.CHANGED_FILE)
+        
+        # Optional quantized index used by semantic_search
+        self.quantization = quantization
+        self.quantized_path = os.path.join(self.db_path, self.QUANTIZED_DIR)
+        self.quantized_index = QuantizedIndex.load(self.quantized_path) if quantization else None
+        self._quantized_signature = QuantizedIndex.signature(self.quantized_path)
+        
+    @property
+    def embedding_service(self) -> EmbeddingService:
+        """The process-wide embedding service for this manager's model."""
+        return get_embedding_service(self.embedding_model_name)
+    
+    @property
+    def embedding_model(self) -> Any:
+        """The fastembed model behind the embedding service."""
+        return self.embedding_service.model
+    
     def _ensure_db_exists(self) -> None:
         """Ensure vector database directory exists."""
         if not os.path.exists(self.db_path):
@@ -44,24 +86,306 @@ class VectorManager:
         """
         Generate embeddings for text.
         
+        Requests from concurrent sessions are batched together by the
+        shared embedding service; a stalled service raises a TimeoutError
+        after EMBED_TIMEOUT seconds instead of blocking the caller forever.
+        
         Args:
             text: Text to embed
             
         Returns:
             Embedding vector
         """
-        embeddings = list(self.embedding_model.embed([text]))
-        return embeddings[0].tolist()
+        return self.embedding_service.embed(text, timeout=self.EMBED_TIMEOUT)
+    
+    @staticmethod
+    def _product_text(product: Dict[str, Any]) -> str:
+        """
+        Build the text that represents a product for embedding.
+        
+        Args:
+            product: Product information dictionary
+            
+        Returns:
+            Name, brand, category, description and features joined as text
+        """
+        parts = [
+            product.get("name", ""),
+            product.get("brand", ""),
+            product.get("category", ""),
+            product.get("description", ""),
+            ", ".join(product.get("features", [])),
+        ]
+        return ". ".join(part for part in parts if part)
     
     def index_product(self, product: Dict[str, Any]) -> None:
         """
         Index a product in the vector database.
         
+        The product's neighborhood is marked as changed so the next
+        refresh_neighbors() call recomputes only the affected neighbors.
+        
         Args:
             product: Product information dictionary
         """
-        # Function to be implemented
-        pass
+        self.index_products([product])
+    
+    def index_products(
+        self,
+        products: List[Dict[str, Any]],
+        vectors: Optional[List[List[float]]] = None,
+    ) -> int:
+        """
+        Index a batch of products with a single vector store write.
+        
+        Args:
+            products: Product information dictionaries
+            vectors: Precomputed embeddings aligned with products; computed
+                here in one batch when omitted
+            
+        Returns:
+            Number of products indexed
+        """
+        if not products:
+            return 0
+        
+        if vectors is None:
+            vectors = self.embedding_service.embed_batch([self._product_text(p) for p in products])
+        
+        rows = [
+            {
+                "id": int(product["id"]),
+                "name": product.get("name", ""),
+                "brand": product.get("brand", ""),
+                "category": product.get("category", ""),
+                "price": float(product.get("price") or 0.0),
+                "vector": list(vector),
+            }
+            for product, vector in zip(products, vectors)
+        ]
+        
+        if self.TABLE_NAME in self.db.table_names():
+            table = self.db.open_table(self.TABLE_NAME)
+            table.merge_insert("id").when_matched_update_all().when_not_matched_insert_all().execute(rows)
+        else:
+            self.db.create_table(self.TABLE_NAME, data=rows)
+        
+        self._append_changed_ids(row["id"] for row in rows)
+        # Searches fall back to exact LanceDB search until the index is rebuilt
+        QuantizedIndex.mark_stale(self.quantized_path)
+        return len(rows)
+    
+    @staticmethod
+    def _file_signature(path: str) -> Optional[int]:
+        """Modification time of a file, or None if it does not exist."""
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+    
+    def _append_changed_ids(self, product_ids: Iterable[int]) -> None:
+        """Append product IDs to the changed-ID log, one per line."""
+        lines = "".join(f"{int(pid)}\n" for pid in product_ids)
+        with open(self.changed_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(lines)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _read_changed_ids(self) -> Tuple[set, int]:
+        """
+        Read the changed-ID log.
+        
+        Returns:
+            Tuple of (product IDs, log size in bytes at the time of reading)
+        """
+        if not os.path.exists(self.changed_path):
+            return set(), 0
+        with open(self.changed_path, "rb") as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            try:
+                data = f.read()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        # A trailing partial line can only come from a crashed writer
+        complete = data[:data.rfind(b"\n") + 1]
+        return {int(line) for line in complete.split()}, len(complete)
+    
+    def _truncate_changed_ids(self, offset: int) -> None:
+        """
+        Drop the first offset bytes of the changed-ID log.
+        
+        IDs appended after offset (by other writers during a refresh) are
+        kept. The log is rewritten in place under the lock rather than
+        replaced, so appenders blocked on the lock write to the same file.
+        """
+        if offset == 0 or not os.path.exists(self.changed_path):
+            return
+        with open(self.changed_path, "r+b") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(offset)
+                remainder = f.read()
+                f.seek(0)
+                f.write(remainder)
+                f.truncate()
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+    
+    def _load_vectors(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Load every product ID and embedding from the vector store.
+        
+        Returns:
+            Tuple of (product_ids, vectors) arrays
+        """
+        if self.TABLE_NAME not in self.db.table_names():
+            return np.empty(0, dtype=np.int64), np.empty((0, 0), dtype=np.float32)
+        
+        data = self.db.open_table(self.TABLE_NAME).to_arrow().select(["id", "vector"])
+        product_ids = data.column("id").to_numpy()
+        vectors = np.stack(data.column("vector").to_numpy(zero_copy_only=False)).astype(np.float32)
+        return product_ids, vectors
+    
+    def refresh_neighbors(
+        self,
+        changed_ids: Optional[List[int]] = None,
+        full: bool = False,
+        chunk_size: int = 1024,
+    ) -> None:
+        """
+        Recompute the precomputed neighbor table and persist it.
+        
+        By default only neighborhoods touched by products indexed since the
+        last refresh (plus any changed_ids given) are recomputed. A full
+        rebuild happens when requested or when no table exists yet.
+        
+        Args:
+            changed_ids: Additional product IDs whose embeddings changed
+            full: Rebuild the table for the whole catalog
+            chunk_size: Rows per block for the similarity computation
+        """
+        product_ids, vectors = self._load_vectors()
+        if len(product_ids) == 0:
+            return
+        
+        recorded, offset = self._read_changed_ids()
+        changed = recorded | set(changed_ids or [])
+        neighbor_table = self._current_neighbor_table()
+        if full or neighbor_table is None or neighbor_table.k != self.neighbor_k:
+            self.neighbor_table = NeighborTable.build(product_ids, vectors, self.neighbor_k, chunk_size)
+        else:
+            self.neighbor_table = neighbor_table.refresh(product_ids, vectors, changed, chunk_size)
+        
+        self.neighbor_table.save(self.neighbor_path)
+        self._neighbor_signature = self._file_signature(self.neighbor_path)
+        # Keep IDs logged by other writers while this refresh was running
+        self._truncate_changed_ids(offset)
+    
+    def _current_neighbor_table(self) -> Optional[NeighborTable]:
+        """
+        The neighbor table, reloaded when another process rewrote it.
+        
+        Returns:
+            The current NeighborTable, or None if none has been built
+        """
+        signature = self._file_signature(self.neighbor_path)
+        if signature != self._neighbor_signature:
+            self.neighbor_table = NeighborTable.load(self.neighbor_path)
+            self._neighbor_signature = signature
+        return self.neighbor_table
+    
+    def build_quantized_index(self, mode: Optional[str] = None) -> bool:
+        """
+        Rebuild the quantized search index from the vector store.
+        
+        Writes int8 or binary codes plus a memory-mapped float32 copy of
+        the normalized vectors used for exact rescoring, and publishes them
+        atomically; other processes pick up the new index on their next
+        search.
+        
+        Args:
+            mode: Quantization mode; defaults to this manager's quantization,
+                then to the mode of the index already on disk
+            
+        Returns:
+            True if an index was built, False if there was nothing to build
+        """
+        if mode is None:
+            mode = self.quantization
+        if mode is None:
+            existing = QuantizedIndex.load(self.quantized_path)
+            mode = existing.mode if existing is not None else None
+        if mode is None:
+            return False
+        
+        product_ids, vectors = self._load_vectors()
+        if len(product_ids) == 0:
+            return False
+        
+        index = QuantizedIndex.build(self.quantized_path, product_ids, vectors, mode)
+        if self.quantization is not None:
+            self.quantized_index = index
+            self._quantized_signature = QuantizedIndex.signature(self.quantized_path)
+        return True
+    
+    def _current_quantized_index(self) -> Optional[QuantizedIndex]:
+        """
+        The quantized index to search with, reloaded when it was rebuilt.
+        
+        Returns:
+            The current index, or None when quantization is off, no index
+            exists, or products were indexed since it was built
+        """
+        if self.quantization is None:
+            return None
+        signature = QuantizedIndex.signature(self.quantized_path)
+        if signature != self._quantized_signature:
+            self.quantized_index = QuantizedIndex.load(self.quantized_path)
+            self._quantized_signature = signature
+        if self.quantized_index is None or self.quantized_index.stale:
+            return None
+        return self.quantized_index
+    
+    @classmethod
+    def _where_clause(cls, filters: Optional[Dict[str, Any]]) -> Optional[str]:
+        """
+        Translate search filters into a LanceDB SQL filter.
+        
+        Only the stored product columns can be filtered on; numeric columns
+        are coerced to numbers and text values are quoted.
+        
+        Args:
+            filters: Column equality filters, plus min_price and max_price
+            
+        Returns:
+            SQL filter expression, or None if there are no filters
+        
+        Raises:
+            ValueError: For a filter on an unknown column or a non-numeric
+                value for id or price
+        """
+        clauses = []
+        for key, value in (filters or {}).items():
+            if value is None:
+                continue
+            if key == "min_price":
+                clauses.append(f"price >= {float(value)}")
+            elif key == "max_price":
+                clauses.append(f"price <= {float(value)}")
+            elif key not in cls.FILTER_COLUMNS:
+                raise ValueError(f"Unsupported filter: {key}")
+            elif key == "id":
+                clauses.append(f"id = {int(value)}")
+            elif key == "price":
+                clauses.append(f"price = {float(value)}")
+            else:
+                escaped = str(value).replace("'", "''")
+                clauses.append(f"{key} = '{escaped}'")
+        return " AND ".join(clauses) if clauses else None
     
     def semantic_search(
         self, 
@@ -80,8 +404,37 @@ class VectorManager:
         Returns:
             List of matching product dictionaries with similarity scores
         """
-        # Function to be implemented
-        pass
+        if self.TABLE_NAME not in self.db.table_names():
+            return []
+        
+        table = self.db.open_table(self.TABLE_NAME)
+        query_vector = self._embed_text(query)
+        where = self._where_clause(filters)
+        
+        quantized_index = self._current_quantized_index()
+        if quantized_index is None:
+            search = table.search(query_vector).limit(limit)
+            if where:
+                search = search.where(where, prefilter=True)
+            return [
+                {**{k: v for k, v in row.items() if k != "vector"},
+                 "similarity_score": 1.0 - row["_distance"] / 2.0}
+                for row in search.to_list()
+            ]
+        
+        # Oversample when filtering so enough candidates survive the filter
+        hits = quantized_index.search(query_vector, limit * 4 if where else limit)
+        if not hits:
+            return []
+        
+        scores = dict(hits)
+        id_filter = f"id IN ({', '.join(str(pid) for pid, _ in hits)})"
+        rows = table.search().where(f"{id_filter} AND {where}" if where else id_filter).limit(len(hits)).to_list()
+        rows.sort(key=lambda row: scores[row["id"]], reverse=True)
+        return [
+            {**{k: v for k, v in row.items() if k != "vector"}, "similarity_score": scores[row["id"]]}
+            for row in rows[:limit]
+        ]
     
     def get_similar_products(
         self, 
@@ -91,6 +444,11 @@ class VectorManager:
         """
         Find products similar to a given product.
         
+        Neighbors are an O(1) read from the precomputed neighbor table (run
+        refresh_neighbors() after indexing to keep it current; a table
+        rebuilt by another process is picked up on the next call); their
+        product fields are fetched from the vector store in one lookup.
+        
         Args:
             product_id: ID of the reference product
             limit: Maximum number of similar products to return
@@ -98,5 +456,19 @@ class VectorManager:
         Returns:
             List of similar product dictionaries with similarity scores
         """
-        # Function to be implemented
-        pass
\ No newline at end of file
+        neighbor_table = self._current_neighbor_table()
+        if neighbor_table is None or self.TABLE_NAME not in self.db.table_names():
+            return []
+        
+        neighbors = neighbor_table.get(product_id, limit)
+        if not neighbors:
+            return []
+        
+        scores = dict(neighbors)
+        id_filter = f"id IN ({', '.join(str(int(pid)) for pid in scores)})"
+        rows = self.db.open_table(self.TABLE_NAME).search().where(id_filter).limit(len(scores)).to_list()
+        rows.sort(key=lambda row: scores[row["id"]], reverse=True)
+        return [
+            {**{k: v for k, v in row.items() if k != "vector"}, "similarity_score": scores[row["id"]]}
+            for row in rows
+        ]
\ No newline at end of file
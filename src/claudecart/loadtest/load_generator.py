@@ -0,0 +1,359 @@
+import argparse
+import functools
+import json
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from anthropic import Anthropic
+
+from claudecart.backend import ClaudeController
+from claudecart.loadtest.stub_server import LatencyProfile, ServiceProfile, StubConfig, StubServer, fetch_stats
+from claudecart.mcp_tools.inventory_tools import set_db_path
+from claudecart.mcp_tools.search_tools import set_search_client
+from claudecart.mcp_tools.tool_registry import tool_registry
+from claudecart.utils.firecrawl_scraper import scrape_web_page
+from claudecart.utils.tavliy_client import TavilySearchClient
+
+
+CHAT_QUERIES = [
+    "What noise cancelling headphones do you carry?",
+    "Do you price match Walmart?",
+    "Compare the Dell XPS 13 and the MacBook Air",
+    "What is your return policy on opened electronics?",
+    "Which running shoes are under $150?",
+    "What brands of stand mixers do you have?",
+]
+
+PRODUCT_URLS = [
+    "https://www.bestbuy.com/site/sony-wh-1000xm5/6505727.p",
+    "https://www.walmart.com/ip/instant-pot-duo/123456",
+    "https://www.target.com/p/dyson-v15-detect/-/A-8392",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Get a percentile with nearest-rank interpolation.
+
+    Args:
+        values: Sample values
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile value, or 0.0 for no samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+class TurnResult:
+    """Outcome of one simulated chat turn."""
+
+    def __init__(self, kind: str, latency: float, success: bool, error: Optional[str] = None):
+        """
+        Initialize the turn result.
+
+        Args:
+            kind: Query type, "chat" or "price_match"
+            latency: Seconds from user message to assistant reply
+            success: Whether the turn produced a reply
+            error: Error message for failed turns
+        """
+        self.kind = kind
+        self.latency = latency
+        self.success = success
+        self.error = error
+
+
+class LoadGenerator:
+    """
+    Simulates concurrent ClaudeCart chat sessions against the stub APIs.
+
+    Each session keeps its own history and session id and runs a mix of
+    plain questions and price-match turns (scrape a product page, then ask
+    Claude to analyze it), exactly as the Streamlit app does.
+    """
+
+    def __init__(
+        self,
+        controller: ClaudeController,
+        scrape: Callable[[str], Any],
+        price_match_ratio: float = 0.3,
+        think_time: float = 1.0,
+        seed: Optional[int] = None,
+        service_stats: Optional[Callable[[], Dict[str, Dict[str, int]]]] = None,
+    ):
+        """
+        Initialize the load generator.
+
+        Args:
+            controller: Controller wired to the stub Anthropic endpoint
+            scrape: Function scraping a product URL through the stub Firecrawl
+            price_match_ratio: Fraction of turns that are price matches
+            think_time: Mean seconds a simulated user waits between turns
+            seed: Random seed for reproducible query mixes
+            service_stats: Returns cumulative HTTP status counts per stubbed
+                service, e.g. StubServer.stats.snapshot
+        """
+        self.controller = controller
+        self.scrape = scrape
+        self.price_match_ratio = price_match_ratio
+        self.think_time = think_time
+        self.service_stats = service_stats
+        self._seed = random.Random(seed)
+        self._seed_lock = threading.Lock()
+
+    def _session(self, turns: int) -> List[TurnResult]:
+        """Run one simulated session and return its turn results."""
+        with self._seed_lock:
+            rng = random.Random(self._seed.random())
+        session_id = str(uuid.uuid4())
+        messages: List[Dict[str, Any]] = []
+        results = []
+
+        for _ in range(turns):
+            kind = "price_match" if rng.random() < self.price_match_ratio else "chat"
+            started = time.monotonic()
+            try:
+                if kind == "price_match":
+                    url = rng.choice(PRODUCT_URLS)
+                    page = self.scrape(url)
+                    markdown = getattr(page, "markdown", None) or (page.get("markdown", "") if isinstance(page, dict) else "")
+                    content = (f"Can you analyze this product for price matching? "
+                               f"I found this information from {url}:\n\n{str(markdown)[:1000]}...")
+                else:
+                    content = rng.choice(CHAT_QUERIES)
+                messages.append({"role": "user", "content": content})
+
+                response = self.controller.chat(messages=messages, session_id=session_id)
+                latency = time.monotonic() - started
+                if response["success"]:
+                    messages.append({"role": "assistant", "content": response["content"] or "(no content)"})
+                    results.append(TurnResult(kind, latency, True))
+                else:
+                    messages.pop()
+                    results.append(TurnResult(kind, latency, False, response.get("error")))
+            except Exception as e:
+                results.append(TurnResult(kind, time.monotonic() - started, False, str(e)))
+
+            if self.think_time > 0:
+                time.sleep(rng.expovariate(1.0 / self.think_time))
+
+        return results
+
+    def run_level(self, sessions: int, turns: int) -> Dict[str, Any]:
+        """
+        Run a fixed number of concurrent sessions to completion.
+
+        Args:
+            sessions: Number of concurrent simulated sessions
+            turns: Chat turns per session
+
+        Returns:
+            Report with throughput, latency percentiles, error counts and
+            the HTTP status counts each stubbed service returned
+        """
+        services_before = self.service_stats() if self.service_stats else {}
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="session") as pool:
+            session_results = list(pool.map(lambda _: self._session(turns), range(sessions)))
+        elapsed = time.monotonic() - started
+
+        results = [result for session in session_results for result in session]
+        report: Dict[str, Any] = {
+            "sessions": sessions,
+            "turns": len(results),
+            "elapsed_s": elapsed,
+            "throughput_turns_per_s": len(results) / elapsed if elapsed else 0.0,
+            "error_rate": sum(not r.success for r in results) / len(results) if results else 0.0,
+        }
+        for kind in ("all", "chat", "price_match"):
+            latencies = [r.latency for r in results if r.success and kind in ("all", r.kind)]
+            report[kind] = {
+                "count": len(latencies),
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p90_ms": percentile(latencies, 90) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "max_ms": max(latencies, default=0.0) * 1000,
+            }
+        errors: Dict[str, int] = {}
+        for result in results:
+            if not result.success:
+                key = (result.error or "unknown")[:80]
+                errors[key] = errors.get(key, 0) + 1
+        report["errors"] = errors
+        if self.service_stats:
+            services: Dict[str, Dict[str, int]] = {}
+            for service, counts in self.service_stats().items():
+                before = services_before.get(service, {})
+                delta = {status: count - before.get(status, 0) for status, count in counts.items()}
+                services[service] = {status: count for status, count in delta.items() if count}
+            report["services"] = services
+        report["tools_cumulative"] = tool_registry.get_tool_stats()
+        return report
+
+    def sweep(
+        self,
+        levels: List[int],
+        turns: int,
+        slo_p99_ms: float,
+        min_gain: float = 0.1,
+        on_level: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run increasing concurrency levels and find the saturation point.
+
+        A level is saturated when its p99 latency exceeds the SLO, or when
+        throughput improves by less than min_gain over the previous level
+        (more sessions only add queueing).
+
+        Args:
+            levels: Concurrency levels to run, in increasing order
+            turns: Chat turns per session
+            slo_p99_ms: p99 latency objective in milliseconds
+            min_gain: Minimum relative throughput gain to count as scaling
+            on_level: Optional callback invoked with each level's report
+
+        Returns:
+            Dictionary with per-level reports and the saturation summary
+        """
+        reports = []
+        saturated_at = None
+        for sessions in levels:
+            report = self.run_level(sessions, turns)
+            reports.append(report)
+            if on_level:
+                on_level(report)
+
+            previous = reports[-2] if len(reports) > 1 else None
+            over_slo = report["all"]["p99_ms"] > slo_p99_ms
+            flat = previous is not None and \
+                report["throughput_turns_per_s"] < previous["throughput_turns_per_s"] * (1 + min_gain)
+            if over_slo or flat:
+                saturated_at = sessions
+                break
+
+        within_slo = [r for r in reports if r["all"]["p99_ms"] <= slo_p99_ms]
+        return {
+            "levels": reports,
+            "saturated_at_sessions": saturated_at,
+            "max_sessions_within_slo": max((r["sessions"] for r in within_slo), default=0),
+            "peak_throughput_turns_per_s": max((r["throughput_turns_per_s"] for r in reports), default=0.0),
+        }
+
+
+def _print_level(report: Dict[str, Any]) -> None:
+    """Print a one-line summary of a concurrency level."""
+    latency = report["all"]
+    service_errors = ", ".join(
+        f"{service} {sum(count for status, count in counts.items() if status != '200')}"
+        for service, counts in sorted(report.get("services", {}).items())
+    )
+    print(f"{report['sessions']:>5} sessions | {report['throughput_turns_per_s']:7.2f} turns/s | "
+          f"p50 {latency['p50_ms']:8.0f}ms  p90 {latency['p90_ms']:8.0f}ms  p99 {latency['p99_ms']:8.0f}ms | "
+          f"errors {report['error_rate']:6.1%}" + (f" | HTTP errors: {service_errors}" if service_errors else ""))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="claudecart-loadtest",
+        description="Load-test ClaudeCart chat sessions against local API stand-ins.",
+    )
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64],
+                        help="Concurrency levels to sweep")
+    parser.add_argument("--turns", type=int, default=5, help="Chat turns per session")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between turns")
+    parser.add_argument("--price-match-ratio", type=float, default=0.3)
+    parser.add_argument("--slo-p99-ms", type=float, default=15000)
+    parser.add_argument("--anthropic-ms", type=float, nargs=2, default=[1500, 6000], metavar=("MEDIAN", "P99"))
+    parser.add_argument("--tavily-ms", type=float, nargs=2, default=[600, 2500], metavar=("MEDIAN", "P99"))
+    parser.add_argument("--firecrawl-ms", type=float, nargs=2, default=[2000, 8000], metavar=("MEDIAN", "P99"))
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.02, help="Fraction of HTTP 429 responses")
+    parser.add_argument("--tool-use-rate", type=float, default=0.5)
+    parser.add_argument("--max-retries", type=int, default=2, help="Anthropic client retries")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--stub-url",
+                        help="Use stand-ins already running at this URL (claudecart-stub-apis) instead of "
+                             "starting them in this process; the latency and error options are then ignored")
+    parser.add_argument("--db-path", help="SQLite database for the inventory tools (default: a temporary one)")
+    parser.add_argument("--json", dest="json_path", help="Write the full report to this file")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Console script entry point."""
+    args = build_parser().parse_args(argv)
+
+    def profile(latency: List[float]) -> ServiceProfile:
+        return ServiceProfile(LatencyProfile(*latency), args.error_rate, args.rate_limit_rate, retry_after=0.5)
+
+    # An external stub keeps its HTTP and JSON work off this interpreter's GIL
+    stub = None
+    if args.stub_url:
+        base_url = args.stub_url.rstrip("/")
+        service_stats = functools.partial(fetch_stats, base_url)
+        print(f"Using stub APIs at {base_url}")
+    else:
+        stub = StubServer(StubConfig(
+            anthropic=profile(args.anthropic_ms),
+            tavily=profile(args.tavily_ms),
+            firecrawl=profile(args.firecrawl_ms),
+            tool_use_rate=args.tool_use_rate,
+            seed=args.seed,
+        )).start()
+        base_url = stub.base_url
+        service_stats = stub.stats.snapshot
+        print(f"Stub APIs on {base_url} (in process; use --stub-url to run them separately)")
+
+    # Tool calls such as get_facets must not create or touch the app database
+    tmp_dir = None if args.db_path else tempfile.mkdtemp(prefix="claudecart-loadtest-")
+    try:
+        set_db_path(args.db_path or os.path.join(tmp_dir, "claudecart.db"))
+        client = Anthropic(api_key="stub", base_url=base_url, max_retries=args.max_retries)
+        controller = ClaudeController(api_key="stub", client=client)
+        set_search_client(TavilySearchClient(api_key="stub", api_base_url=base_url))
+        generator = LoadGenerator(
+            controller,
+            scrape=lambda url: scrape_web_page(url, "stub", api_url=base_url),
+            price_match_ratio=args.price_match_ratio,
+            think_time=args.think_time,
+            seed=args.seed,
+            service_stats=service_stats,
+        )
+
+        summary = generator.sweep(sorted(args.sessions), args.turns, args.slo_p99_ms, on_level=_print_level)
+        summary["stub_requests"] = service_stats()
+    finally:
+        set_search_client(None)
+        set_db_path(None)
+        if stub is not None:
+            stub.stop()
+        if tmp_dir is not None:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    print(f"Peak throughput: {summary['peak_throughput_turns_per_s']:.2f} turns/s")
+    print(f"Max sessions within p99 SLO ({args.slo_p99_ms:.0f}ms): {summary['max_sessions_within_slo']}")
+    if summary["saturated_at_sessions"] is not None:
+        print(f"Saturated at {summary['saturated_at_sessions']} sessions")
+    else:
+        print("Not saturated at the highest level tested")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+
+class LatencyProfile:
+    """
+    Log-normal latency distribution described by its median and p99.
+
+    Real API latencies are right-skewed; a log-normal fitted to a median
+    and a 99th percentile reproduces the long tail that drives saturation.
+    """
+
+    def __init__(self, median_ms: float, p99_ms: Optional[float] = None):
+        """
+        Initialize the latency profile.
+
+        Args:
+            median_ms: Median latency in milliseconds
+            p99_ms: 99th percentile latency in milliseconds, defaults to 3x median
+        """
+        self.median_ms = median_ms
+        self.p99_ms = p99_ms if p99_ms is not None else median_ms * 3
+        # z-score of the 99th percentile of a standard normal
+        self.sigma = math.log(max(self.p99_ms, median_ms) / median_ms) / 2.326 if median_ms > 0 else 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Draw a latency in seconds."""
+        if self.median_ms <= 0:
+            return 0.0
+        return rng.lognormvariate(math.log(self.median_ms), self.sigma) / 1000.0
+
+
+class ServiceProfile:
+    """
+    Behavior of one stubbed API: latency plus injected failures.
+    """
+
+    def __init__(
+        self,
+        latency: LatencyProfile,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        retry_after: float = 1.0,
+    ):
+        """
+        Initialize the service profile.
+
+        Args:
+            latency: Response latency distribution
+            error_rate: Fraction of requests answered with HTTP 500
+            rate_limit_rate: Fraction of requests answered with HTTP 429
+            retry_after: Retry-After seconds sent with 429 responses
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+
+
+class StubConfig:
+    """
+    Configuration for the local Anthropic, Tavily and Firecrawl stand-ins.
+    """
+
+    def __init__(
+        self,
+        anthropic: Optional[ServiceProfile] = None,
+        tavily: Optional[ServiceProfile] = None,
+        firecrawl: Optional[ServiceProfile] = None,
+        tool_use_rate: float = 0.5,
+        batch_seconds: float = 2.0,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the stub configuration.
+
+        Args:
+            anthropic: Profile for the Messages API, defaults to ~1.5s median
+            tavily: Profile for the search API, defaults to ~600ms median
+            firecrawl: Profile for the scrape API, defaults to ~2s median
+            tool_use_rate: Probability that a Messages request offering tools
+                is answered with a tool_use block instead of text
+            batch_seconds: Time a Message Batch takes to finish processing
+            seed: Random seed for reproducible runs
+        """
+        self.anthropic = anthropic or ServiceProfile(LatencyProfile(1500, 6000))
+        self.tavily = tavily or ServiceProfile(LatencyProfile(600, 2500))
+        self.firecrawl = firecrawl or ServiceProfile(LatencyProfile(2000, 8000))
+        self.tool_use_rate = tool_use_rate
+        self.batch_seconds = batch_seconds
+        self.seed = seed
+
+
+class StubStats:
+    """Thread-safe request counters per stubbed endpoint."""
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, service: str, status: int) -> None:
+        """Count one response for a service."""
+        with self._lock:
+            counts = self.counts.setdefault(service, {})
+            counts[str(status)] = counts.get(str(status), 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Copy of the counters."""
+        with self._lock:
+            return {service: dict(counts) for service, counts in self.counts.items()}
+
+
+def _message_response(request: Dict[str, Any], config: StubConfig, rng: random.Random) -> Dict[str, Any]:
+    """Build an Anthropic Messages API response for a request."""
+    messages = request.get("messages", [])
+    last_content = messages[-1]["content"] if messages else ""
+    answering_tool = isinstance(last_content, list) and any(
+        isinstance(block, dict) and block.get("type") == "tool_result" for block in last_content
+    )
+    tools = request.get("tools") or []
+    if (request.get("tool_choice") or {}).get("type") == "none":
+        tools = []
+    prompt_chars = len(json.dumps(messages))
+
+    if tools and not answering_tool and rng.random() < config.tool_use_rate:
+        tool = rng.choice(tools)
+        if tool["name"] == "search_competitor_prices":
+            tool_input = {"product_name": "Sony WH-1000XM5", "retailers": ["Walmart", "Target"]}
+        elif tool["name"] == "get_price_match_policy":
+            tool_input = {"retailer": rng.choice(["bestbuy", "walmart", "target"])}
+        else:
+            tool_input = {}
+        content = [
+            {"type": "text", "text": "Let me look that up."},
+            {"type": "tool_use", "id": f"toolu_{uuid.uuid4().hex[:24]}", "name": tool["name"], "input": tool_input},
+        ]
+        stop_reason = "tool_use"
+    elif "JSON" in json.dumps(request.get("system", "")):
+        # Structured answer for callers that ask for JSON, e.g. the price audit
+        answer = [
+            {
+                "competitor": competitor,
+                "competitor_price": round(rng.uniform(50, 1500), 2),
+                "price_match_eligible": rng.random() < 0.5,
+                "recommendation": "Match the competitor price" if rng.random() < 0.3 else "No action",
+            }
+            for competitor in ("Target", "Walmart", "BestBuy")
+        ]
+        content = [{"type": "text", "text": json.dumps(answer)}]
+        stop_reason = "end_turn"
+    else:
+        content = [{"type": "text", "text": "Here is what I found for you. " * rng.randint(5, 40)}]
+        stop_reason = "end_turn"
+
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:24]}",
+        "type": "message",
+        "role": "assistant",
+        "model": request.get("model", "stub"),
+        "content": content,
+        "stop_reason": stop_reason,
+        "stop_sequence": None,
+        "usage": {"input_tokens": prompt_chars // 4 + 1, "output_tokens": len(json.dumps(content)) // 4 + 1},
+    }
+
+
+def _search_response(request: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Build a Tavily search response for a request."""
+    query = request.get("query", "")
+    return {
+        "query": query,
+        "results": [
+            {
+                "title": f"{query} - result {i + 1}",
+                "url": f"https://retailer.example/{uuid.uuid4().hex[:8]}",
+                "content": f"{query} now ${rng.uniform(50, 1500):.2f}. Free shipping.",
+                "score": round(rng.random(), 3),
+            }
+            for i in range(min(int(request.get("max_results", 5)), 10))
+        ],
+        "response_time": 0.0,
+    }
+
+
+def _scrape_response(request: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """Build a Firecrawl v1 scrape response for a request."""
+    url = request.get("url", "")
+    price = rng.uniform(50, 1500)
+    markdown = f"# Product page\n\nSource: {url}\n\nPrice: ${price:.2f}\n\n" + "Specification line.\n" * 50
+    return {
+        "success": True,
+        "data": {
+            "markdown": markdown,
+            "html": f"<html><body><h1>Product page</h1><p>Price: ${price:.2f}</p></body></html>",
+            "metadata": {"sourceURL": url, "statusCode": 200},
+        },
+    }
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Routes requests to the stubbed Anthropic, Tavily and Firecrawl endpoints."""
+
+    protocol_version = "HTTP/1.1"
+
+    ROUTES = {
+        "/v1/messages": "anthropic",
+        "/search": "tavily",
+        "/v1/scrape": "firecrawl",
+        "/v1/messages/batches": "anthropic",
+    }
+    STATS_PATH = "/stub/stats"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Silence per-request logging."""
+
+    def do_GET(self) -> None:
+        server: "StubServer" = self.server  # type: ignore[assignment]
+        path = self.path.split("?", 1)[0]
+        if path == self.STATS_PATH:
+            self._send(200, server.stats.snapshot())
+            return
+        parts = path.strip("/").split("/")
+        if len(parts) < 4 or parts[:3] != ["v1", "messages", "batches"]:
+            self._send(404, {"error": f"Unknown stub endpoint: {path}"})
+            return
+
+        batch = server.get_batch(parts[3])
+        if batch is None:
+            self._send(404, {"type": "error", "error": {"type": "not_found_error", "message": "No such batch"}})
+            return
+        if len(parts) == 4:
+            self._send(200, server.batch_object(batch))
+            return
+        if server.batch_object(batch)["processing_status"] != "ended":
+            self._send(404, {"type": "error", "error": {"type": "not_found_error", "message": "Batch not ended"}})
+            return
+
+        data = "".join(json.dumps(result) + "\n" for result in batch["results"]).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/binary")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self) -> None:
+        server: "StubServer" = self.server  # type: ignore[assignment]
+        path = self.path.split("?", 1)[0]
+        service = self.ROUTES.get(path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        if service is None:
+            self._send(404, {"error": f"Unknown stub endpoint: {path}"})
+            return
+
+        profile: ServiceProfile = getattr(server.config, service)
+        rng = server.rng()
+        time.sleep(profile.latency.sample(rng))
+
+        roll = rng.random()
+        if roll < profile.rate_limit_rate:
+            server.stats.record(service, 429)
+            self._send(429, {"type": "error", "error": {"type": "rate_limit_error", "message": "Stub rate limit"}},
+                       {"Retry-After": str(profile.retry_after)})
+            return
+        if roll < profile.rate_limit_rate + profile.error_rate:
+            server.stats.record(service, 500)
+            self._send(500, {"type": "error", "error": {"type": "api_error", "message": "Stub server error"}})
+            return
+
+        request = json.loads(body or b"{}")
+        if path == "/v1/messages/batches":
+            payload = server.batch_object(server.create_batch(request, rng))
+        elif service == "anthropic":
+            payload = _message_response(request, server.config, rng)
+        elif service == "tavily":
+            payload = _search_response(request, rng)
+        else:
+            payload = _scrape_response(request, rng)
+        server.stats.record(service, 200)
+        self._send(200, payload)
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def fetch_stats(base_url: str, timeout: float = 10.0) -> Dict[str, Dict[str, int]]:
+    """
+    Read the status counters of a stub server running in another process.
+
+    Args:
+        base_url: Base URL of the stub, e.g. "http://127.0.0.1:8787"
+        timeout: Seconds to wait for the response
+
+    Returns:
+        Mapping of service to HTTP status to request count
+    """
+    with urllib.request.urlopen(base_url.rstrip("/") + _StubHandler.STATS_PATH, timeout=timeout) as response:
+        return json.load(response)
+
+
+class StubServer(ThreadingHTTPServer):
+    """
+    Local HTTP server standing in for the Anthropic, Tavily and Firecrawl APIs.
+
+    Also serves the Message Batches endpoints (create, retrieve, results),
+    finishing each batch after config.batch_seconds.
+
+    Point the SDK clients at base_url: Anthropic(base_url=...),
+    TavilyClient(api_base_url=...) and FirecrawlApp(api_url=...).
+    """
+
+    daemon_threads = True
+
+    def __init__(self, config: StubConfig, host: str = "127.0.0.1", port: int = 0):
+        """
+        Initialize the stub server.
+
+        Args:
+            config: Latency, failure and tool-use behavior
+            host: Interface to bind
+            port: Port to bind, 0 picks a free port
+        """
+        super().__init__((host, port), _StubHandler)
+        self.config = config
+        self.stats = StubStats()
+        self._seed = random.Random(config.seed)
+        self._seed_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._batches: Dict[str, Dict[str, Any]] = {}
+        self._batches_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        """Base URL clients should use."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rng(self) -> random.Random:
+        """Per-request random generator derived from the configured seed."""
+        with self._seed_lock:
+            return random.Random(self._seed.random())
+
+    def create_batch(self, request: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+        """
+        Accept a Message Batch and precompute its results.
+
+        Each request is answered like /v1/messages; a fraction given by the
+        Anthropic error rate comes back as errored results instead.
+
+        Args:
+            request: Batch creation body with a "requests" list
+            rng: Random generator for this request
+
+        Returns:
+            Internal batch record
+        """
+        results = []
+        for item in request.get("requests", []):
+            if rng.random() < self.config.anthropic.error_rate:
+                result = {"type": "errored", "error": {
+                    "type": "error", "error": {"type": "api_error", "message": "Stub batch item error"},
+                }}
+            else:
+                result = {"type": "succeeded", "message": _message_response(item["params"], self.config, rng)}
+            results.append({"custom_id": item["custom_id"], "result": result})
+
+        batch = {
+            "id": f"msgbatch_{uuid.uuid4().hex[:24]}",
+            "created_at": datetime.now(timezone.utc),
+            "ends_at": datetime.now(timezone.utc) + timedelta(seconds=self.config.batch_seconds),
+            "results": results,
+        }
+        with self._batches_lock:
+            self._batches[batch["id"]] = batch
+        return batch
+
+    def get_batch(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a batch record by id."""
+        with self._batches_lock:
+            return self._batches.get(batch_id)
+
+    def batch_object(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Render a batch record as a Message Batches API object."""
+        ended = datetime.now(timezone.utc) >= batch["ends_at"]
+        results = batch["results"]
+        succeeded = sum(r["result"]["type"] == "succeeded" for r in results)
+        return {
+            "id": batch["id"],
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else len(results),
+                "succeeded": succeeded if ended else 0,
+                "errored": len(results) - succeeded if ended else 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": batch["created_at"].isoformat(),
+            "ended_at": batch["ends_at"].isoformat() if ended else None,
+            "expires_at": (batch["created_at"] + timedelta(days=1)).isoformat(),
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.base_url}/v1/messages/batches/{batch['id']}/results" if ended else None,
+        }
+
+    def start(self) -> "StubServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket."""
+        self.shutdown()
+        self.server_close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the stub server standalone, e.g. in a sidecar container."""
+    parser = argparse.ArgumentParser(description="Local stand-ins for the Anthropic, Tavily and Firecrawl APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--anthropic-ms", type=float, nargs=2, default=[1500, 6000], metavar=("MEDIAN", "P99"))
+    parser.add_argument("--tavily-ms", type=float, nargs=2, default=[600, 2500], metavar=("MEDIAN", "P99"))
+    parser.add_argument("--firecrawl-ms", type=float, nargs=2, default=[2000, 8000], metavar=("MEDIAN", "P99"))
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of HTTP 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of HTTP 429 responses")
+    parser.add_argument("--tool-use-rate", type=float, default=0.5)
+    parser.add_argument("--batch-seconds", type=float, default=2.0, help="Message Batch processing time")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    def profile(latency: List[float]) -> ServiceProfile:
+        return ServiceProfile(LatencyProfile(*latency), args.error_rate, args.rate_limit_rate)
+
+    config = StubConfig(
+        anthropic=profile(args.anthropic_ms),
+        tavily=profile(args.tavily_ms),
+        firecrawl=profile(args.firecrawl_ms),
+        tool_use_rate=args.tool_use_rate,
+        batch_seconds=args.batch_seconds,
+        seed=args.seed,
+    )
+    server = StubServer(config, args.host, args.port)
+    print(f"Stub APIs listening on {server.base_url} (status counts at {_StubHandler.STATS_PATH})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
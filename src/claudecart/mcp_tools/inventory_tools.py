@@ -3,6 +3,26 @@ from typing import Any, Dict, List, Optional
 from claudecart.database.sqlite_manager import SQLiteManager
 
 
+# Database override, used to keep load tests away from the app database
+_db_path: Optional[str] = None
+
+
+def set_db_path(db_path: Optional[str]) -> None:
+    """
+    Point the inventory tools at a different SQLite database.
+    
+    Args:
+        db_path: Database file to use, or None to go back to the default
+    """
+    global _db_path
+    _db_path = db_path
+
+
+def _database() -> SQLiteManager:
+    """SQLite manager for the current database path."""
+    return SQLiteManager(_db_path) if _db_path else SQLiteManager()
+
+
 def get_product_by_id(product_id: int) -> Dict[str, Any]:
     """
     Get detailed information about a product by ID.
@@ -13,7 +33,7 @@ def get_product_by_id(product_id: int) -> Dict[str, Any]:
     Returns:
         Dictionary with product details
     """
-    db = SQLiteManager()
+    db = _database()
     product = db.get_product_by_id(product_id)
     
     if not product:
@@ -28,6 +48,7 @@ def search_products(
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     brand: Optional[str] = None,
+    spec_filters: Optional[Dict[str, Dict[str, Any]]] = None,
     limit: int = 5
 ) -> List[Dict[str, Any]]:
     """
@@ -39,18 +60,23 @@ def search_products(
         min_price: Minimum price filter
         max_price: Maximum price filter
         brand: Filter by brand name
+        spec_filters: Specification range filters, e.g.
+            {"memory": {"min": 16, "unit": "GB"}, "weight": {"max": 3, "unit": "lb"}};
+            min/max bounds need a unit (None for unitless values)
         limit: Maximum number of results to return
         
     Returns:
         List of matching product dictionaries
     """
-    db = SQLiteManager()
+    db = _database()
     products = db.search_products(
         query=query,
         category=category,
         min_price=min_price,
         max_price=max_price,
-        brand=brand
+        brand=brand,
+        spec_filters=spec_filters,
+        limit=limit
     )
     
     if not products:
@@ -81,4 +107,32 @@ def check_inventory(product_id: int, location_id: Optional[str] = None) -> Dict[
             {"id": "store1", "name": "Main Street Store", "quantity": 15},
             {"id": "store2", "name": "Downtown Store", "quantity": 10}
         ]
-    }
\ No newline at end of file
+    }
+
+def get_facets(
+    category: Optional[str] = None,
+    brand: Optional[str] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Get the categories, brands, price ranges and ratings available in the catalog.
+    
+    Args:
+        category: Restrict counts to a product category
+        brand: Restrict counts to a brand
+        min_price: Restrict counts to price buckets at or above this price
+        max_price: Restrict counts to price buckets at or below this price
+        
+    Returns:
+        Dictionary of facet values with product counts; "approximate" is
+        true when a price bound falls inside a bucket, so the counts also
+        include products just outside the requested prices
+    """
+    db = _database()
+    return db.get_facets({
+        "category": category,
+        "brand": brand,
+        "min_price": min_price,
+        "max_price": max_price,
+    })
@@ -4,33 +4,22 @@ from typing import List, Dict, Any, Optional
 
 import streamlit as st
 
+from claudecart.utils.tavliy_client import TavilySearchClient
 
-class TavilySearchClient:
-    """Client for interacting with Tavily search API."""
 
-    def __init__(self, api_key: str):
-        self.client = TavilyClient(api_key=api_key)
+# Search client override, used to point the tool at a stub server in load tests
+_search_client: Optional[TavilySearchClient] = None
+
+
+def set_search_client(client: Optional[TavilySearchClient]) -> None:
+    """
+    Inject the search client used by search_competitor_prices.
     
-    def search_product(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        """
-        Search for product information using Tavily.
-        
-        Args:
-            query: Search query string
-            max_results: Maximum number of results to return
-            
-        Returns:
-            List of search results
-        """
-        try:
-            response = self.client.search(
-                query=query,
-                search_depth="basic",
-                max_results=max_results
-            )
-            return response.get("results", [])
-        except Exception as e:
-            return []
+    Args:
+        client: Client to use, or None to go back to the Streamlit secrets key
+    """
+    global _search_client
+    _search_client = client
 
 
 def search_competitor_prices(
@@ -47,19 +36,31 @@ def search_competitor_prices(
         brand: Optional product brand/manufacturer to narrow search
         
     Returns:
-        List of search results from retailers with price information
+        List of search results from retailers with price information; a
+        retailer whose lookup failed gets an empty list
+    
+    Raises:
+        Exception: The last lookup error when every retailer lookup failed,
+            so the tool registry can retry and trip the circuit breaker
     """
-    tavily_client = TavilySearchClient(api_key=st.secrets["secrets"]["TAVILY_API_KEY"])
+    tavily_client = _search_client or TavilySearchClient(api_key=st.secrets["secrets"]["TAVILY_API_KEY"])
     results = []
+    errors: List[Exception] = []
     
     for retailer in retailers:
         query = f"{product_name} {retailer}"
         if brand:
             query = f"{brand} {query}"
-            
-        result = tavily_client.search_product(query=query)
-        results.append(result)
         
+        try:
+            result = tavily_client.search_product(query=query)
+        except Exception as e:
+            errors.append(e)
+            result = []
+        results.append(result)
+    
+    if retailers and len(errors) == len(retailers):
+        raise errors[-1]
     return results
     
     
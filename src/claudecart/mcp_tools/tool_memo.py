@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ToolMemo:
+    """
+    Bounded, TTL-aware memo table for idempotent tool calls.
+
+    One memo table is kept per conversation. Entries are keyed by tool name
+    and the canonicalized JSON of the tool input, so the same call issued
+    with differently ordered arguments hits the same entry. The table is
+    LRU-bounded so a long conversation cannot grow it without limit.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        """
+        Initialize the memo table.
+
+        Args:
+            max_entries: Maximum number of memoized results to keep
+        """
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(tool_name: str, tool_input: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        Build the memo key for a tool call.
+
+        Args:
+            tool_name: Name of the tool
+            tool_input: Parameters passed to the tool
+
+        Returns:
+            Tuple of tool name and canonical JSON of the input
+        """
+        canonical = json.dumps(tool_input, sort_keys=True, separators=(",", ":"), default=str)
+        return tool_name, canonical
+
+    def get(self, tool_name: str, tool_input: Dict[str, Any]) -> Tuple[bool, Any]:
+        """
+        Look up a memoized result.
+
+        Args:
+            tool_name: Name of the tool
+            tool_input: Parameters passed to the tool
+
+        Returns:
+            Tuple of (found, result); result is None when not found
+        """
+        key = self.make_key(tool_name, tool_input)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def put(self, tool_name: str, tool_input: Dict[str, Any], result: Any, ttl: float) -> None:
+        """
+        Memoize a tool result.
+
+        Args:
+            tool_name: Name of the tool
+            tool_input: Parameters passed to the tool
+            result: Result returned by the tool
+            ttl: Seconds the result stays valid
+        """
+        key = self.make_key(tool_name, tool_input)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SessionMemoStore:
+    """
+    Collection of per-conversation ToolMemo tables.
+
+    The number of tracked conversations is bounded as well; the least
+    recently active conversation's memo is dropped first.
+    """
+
+    def __init__(self, max_sessions: int = 256, max_entries_per_session: int = 128):
+        """
+        Initialize the memo store.
+
+        Args:
+            max_sessions: Maximum number of conversations to keep memos for
+            max_entries_per_session: Memo size bound for each conversation
+        """
+        self.max_sessions = max_sessions
+        self.max_entries_per_session = max_entries_per_session
+        self._sessions: "OrderedDict[str, ToolMemo]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def for_session(self, session_id: str) -> ToolMemo:
+        """
+        Get (or create) the memo table for a conversation.
+
+        Args:
+            session_id: Conversation identifier
+
+        Returns:
+            The conversation's ToolMemo
+        """
+        with self._lock:
+            memo = self._sessions.get(session_id)
+            if memo is None:
+                memo = ToolMemo(self.max_entries_per_session)
+                self._sessions[session_id] = memo
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            else:
+                self._sessions.move_to_end(session_id)
+            return memo
+
+    def clear(self, session_id: Optional[str] = None) -> None:
+        """
+        Drop memoized results.
+
+        Args:
+            session_id: Conversation to clear, or None to clear every conversation
+        """
+        with self._lock:
+            if session_id is None:
+                self._sessions.clear()
+            else:
+                self._sessions.pop(session_id, None)
@@ -0,0 +1,254 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+
+# Network, HTTP and socket timeout errors raised by a finished attempt; bad
+# input or bad credentials are not retried, nor are attempts that exceed the
+# policy timeout (see ToolRegistry.execute_tool)
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (OSError,)
+
+
+class ToolPolicy:
+    """
+    Execution policy for a single MCP tool.
+
+    Policies are declared when a tool is registered with the ToolRegistry and
+    control how long a call may run, how many calls may run at once, how
+    failed calls are retried, and when a failing dependency is short-circuited.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = 30.0,
+        max_concurrency: int = 4,
+        max_retries: int = 0,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        retry_on: Tuple[Type[BaseException], ...] = TRANSIENT_ERRORS,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        idempotent: bool = False,
+        cache_ttl: float = 300.0,
+        before_attempt: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Initialize a tool execution policy.
+
+        Args:
+            timeout: Seconds to wait for a single attempt, or None for no limit
+            max_concurrency: Maximum number of in-flight executions (bulkhead size)
+            max_retries: Number of additional attempts after a failed call
+            backoff_base: Initial delay in seconds between retries
+            backoff_max: Upper bound in seconds for the retry delay
+            retry_on: Exception types raised by a tool that are eligible for a
+                retry; attempts that hit the timeout are never retried
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds the circuit stays open before a trial call
+            idempotent: Whether repeated calls with the same input may be memoized
+            cache_ttl: Seconds a memoized result stays valid for idempotent tools
+            before_attempt: Called with the tool input before every attempt
+                that gets past the circuit and bulkhead, retries included,
+                outside the timeout (e.g. to take rate-limit tokens)
+        """
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_on = retry_on
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.idempotent = idempotent
+        self.cache_ttl = cache_ttl
+        self.before_attempt = before_attempt
+
+    def backoff_delay(self, attempt: int) -> float:
+        """
+        Get the delay before the given retry attempt.
+
+        Args:
+            attempt: Zero-based index of the retry
+
+        Returns:
+            Delay in seconds, doubling per attempt up to backoff_max
+        """
+        return min(self.backoff_base * (2 ** attempt), self.backoff_max)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that fails fast while a tool's dependency is down.
+
+    The breaker is closed during normal operation. After a run of consecutive
+    failures it opens and rejects calls until the recovery timeout elapses,
+    then lets a single trial call through (half-open). A successful trial
+    closes the circuit again; a failed one re-opens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds to wait before allowing a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Current circuit state."""
+        with self._lock:
+            if self._state == self.OPEN and self._recovery_elapsed():
+                return self.HALF_OPEN
+            return self._state
+
+    def _recovery_elapsed(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.recovery_timeout
+
+    def allow_request(self) -> bool:
+        """
+        Check whether a call may proceed.
+
+        Returns:
+            True if the call may run, False if it should fail fast
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.OPEN and self._recovery_elapsed():
+                self._state = self.HALF_OPEN
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def release_trial(self) -> None:
+        """Give back a half-open trial that was granted but never executed."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        """Record a successful call and close the circuit."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit if the threshold is hit."""
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ToolStats:
+    """
+    Thread-safe success, failure and latency counters for a tool.
+    """
+
+    def __init__(self):
+        """Initialize empty counters."""
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.invalid = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, outcome: str, latency: float = 0.0) -> None:
+        """
+        Record the outcome of a tool call.
+
+        Args:
+            outcome: One of "success", "failure", "timeout", "rejected" or "invalid"
+            latency: Wall-clock seconds the call took
+        """
+        with self._lock:
+            self.calls += 1
+            if outcome == "success":
+                self.successes += 1
+            elif outcome == "timeout":
+                self.timeouts += 1
+                self.failures += 1
+            elif outcome == "rejected":
+                self.rejected += 1
+            elif outcome == "invalid":
+                self.invalid += 1
+            else:
+                self.failures += 1
+            if outcome not in ("rejected", "invalid"):
+                self.total_latency += latency
+                self.max_latency = max(self.max_latency, latency)
+
+    def record_retry(self) -> None:
+        """Record that a failed attempt is being retried."""
+        with self._lock:
+            self.retries += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a point-in-time copy of the counters.
+
+        Returns:
+            Dictionary of counters and derived latency figures
+        """
+        with self._lock:
+            executed = self.calls - self.rejected - self.invalid
+            return {
+                "calls": self.calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "timeouts": self.timeouts,
+                "rejected": self.rejected,
+                "invalid": self.invalid,
+                "retries": self.retries,
+                "avg_latency_ms": (self.total_latency / executed * 1000) if executed else 0.0,
+                "max_latency_ms": self.max_latency * 1000,
+            }
+
+
+class ToolRuntime:
+    """
+    Per-tool execution state built from a ToolPolicy.
+
+    Each tool gets its own worker pool so that a hung dependency can only
+    exhaust that tool's bulkhead and never the caller's thread or the
+    workers of other tools.
+    """
+
+    def __init__(self, name: str, policy: ToolPolicy):
+        """
+        Initialize the runtime for a tool.
+
+        Args:
+            name: Registered tool name
+            policy: Execution policy to enforce
+        """
+        self.policy = policy
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.recovery_timeout)
+        self.stats = ToolStats()
+        self.slots = threading.BoundedSemaphore(policy.max_concurrency)
+        self.executor = ThreadPoolExecutor(
+            max_workers=policy.max_concurrency,
+            thread_name_prefix=f"tool-{name}",
+        )
@@ -1,5 +1,11 @@
-from typing import Any, Callable, Dict, List
+import inspect
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+
+from .inventory_tools import get_facets
 from .search_tools import search_competitor_prices, get_price_match_policy
+from .tool_policy import ToolPolicy, ToolRuntime
 
 class ToolRegistry:
     """
@@ -8,21 +14,48 @@ class ToolRegistry:
     This class manages the registration and execution of tools that can be 
     called by Claude through the Model Control Protocol (MCP). It provides
     a centralized way to dispatch tool calls to their implementations.
+    
+    Every tool runs under a ToolPolicy that bounds its latency (timeout),
+    its in-flight executions (bulkhead), its retries, and short-circuits
+    calls while its dependency keeps failing (circuit breaker).
     """
     
     def __init__(self):
         """
         Initialize the tool registry with available tools.
         """
-        self.tools: Dict[str, Callable] = {
-            "search_competitor_prices": search_competitor_prices,
-            "get_price_match_policy": get_price_match_policy,
-        }
+        self.tools: Dict[str, Callable] = {}
+        self.policies: Dict[str, ToolPolicy] = {}
+        self._runtimes: Dict[str, ToolRuntime] = {}
+        
+        self.register_tool(
+            "search_competitor_prices",
+            search_competitor_prices,
+            ToolPolicy(timeout=20.0, max_concurrency=4, max_retries=1, idempotent=True, cache_ttl=900.0),
+        )
+        self.register_tool(
+            "get_price_match_policy",
+            get_price_match_policy,
+            ToolPolicy(timeout=5.0, max_concurrency=8, idempotent=True, cache_ttl=3600.0),
+        )
+        self.register_tool(
+            "get_facets",
+            get_facets,
+            ToolPolicy(timeout=5.0, max_concurrency=8, idempotent=True, cache_ttl=60.0),
+        )
     
     def execute_tool(self, tool_name: str, tool_input: Dict[str, Any]) -> Any:
         """
         Execute a tool by name with the provided input parameters.
         
+        The call runs on the tool's own worker pool and is subject to the
+        tool's policy: it is rejected immediately when the circuit is open
+        or the bulkhead is full, abandoned (not retried) after the timeout,
+        and retried with exponential backoff on transient failures raised
+        by a finished attempt. Input that does not match the tool's
+        signature is rejected up front and never counts against the tool's
+        circuit.
+        
         Args:
             tool_name: Name of the tool to execute
             tool_input: Dictionary of parameters to pass to the tool
@@ -33,10 +66,66 @@ class ToolRegistry:
         if tool_name not in self.tools:
             return {"error": f"Unknown tool: {tool_name}"}
         
+        function = self.tools[tool_name]
+        runtime = self._runtimes[tool_name]
+        policy = runtime.policy
+        
         try:
-            return self.tools[tool_name](**tool_input)
-        except Exception as e:
-            return {"error": f"Tool execution failed: {str(e)}"}
+            inspect.signature(function).bind(**tool_input)
+        except TypeError as e:
+            runtime.stats.record("invalid")
+            return {"error": f"Invalid input for {tool_name}: {str(e)}"}
+        
+        started = time.monotonic()
+        attempt = 0
+        
+        while True:
+            if not runtime.breaker.allow_request():
+                runtime.stats.record("rejected")
+                return {"error": f"Tool temporarily unavailable: {tool_name} (circuit open)"}
+            
+            if not runtime.slots.acquire(blocking=False):
+                # Bulkhead full: release a half-open trial without judging the dependency
+                runtime.breaker.release_trial()
+                runtime.stats.record("rejected")
+                return {"error": f"Tool busy: {tool_name} (max {policy.max_concurrency} concurrent calls)"}
+            
+            if policy.before_attempt is not None:
+                try:
+                    policy.before_attempt(tool_input)
+                except BaseException:
+                    runtime.slots.release()
+                    runtime.breaker.release_trial()
+                    raise
+            
+            # The slot is held until the call really finishes, so hung calls
+            # that outlive their timeout keep counting against the bulkhead.
+            future = runtime.executor.submit(function, **tool_input)
+            future.add_done_callback(lambda _: runtime.slots.release())
+            
+            try:
+                result = future.result(timeout=policy.timeout)
+            except FutureTimeoutError:
+                # Never retried: the hung attempt still holds its slot, so a
+                # retry would double both the caller's wait and the slots used
+                runtime.breaker.record_failure()
+                runtime.stats.record("timeout", time.monotonic() - started)
+                return {"error": f"Tool execution timed out after {policy.timeout}s"}
+            except Exception as e:
+                runtime.breaker.record_failure()
+                error = e
+            else:
+                runtime.breaker.record_success()
+                runtime.stats.record("success", time.monotonic() - started)
+                return result
+            
+            if attempt >= policy.max_retries or not isinstance(error, policy.retry_on):
+                runtime.stats.record("failure", time.monotonic() - started)
+                return {"error": f"Tool execution failed: {str(error)}"}
+            
+            time.sleep(policy.backoff_delay(attempt))
+            runtime.stats.record_retry()
+            attempt += 1
     
     def get_available_tools(self) -> List[str]:
         """
@@ -47,15 +136,59 @@ class ToolRegistry:
         """
         return list(self.tools.keys())
     
-    def register_tool(self, name: str, function: Callable) -> None:
+    def register_tool(
+        self,
+        name: str,
+        function: Callable,
+        policy: Optional[ToolPolicy] = None,
+    ) -> None:
         """
         Register a new tool with the registry.
         
         Args:
             name: Name to register the tool under
             function: Callable that implements the tool
+            policy: Execution policy for the tool, defaults to ToolPolicy()
         """
+        if name in self._runtimes:
+            self._runtimes[name].executor.shutdown(wait=False)
+        
+        policy = policy or ToolPolicy()
         self.tools[name] = function
+        self.policies[name] = policy
+        self._runtimes[name] = ToolRuntime(name, policy)
+    
+    def get_policy(self, tool_name: str) -> Optional[ToolPolicy]:
+        """
+        Get the execution policy a tool was registered with.
+        
+        Args:
+            tool_name: Name of the registered tool
+            
+        Returns:
+            The tool's ToolPolicy, or None if the tool is unknown
+        """
+        return self.policies.get(tool_name)
+    
+    def get_tool_stats(self, tool_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get success and latency counters for registered tools.
+        
+        Args:
+            tool_name: Optional tool to report on, defaults to all tools
+            
+        Returns:
+            Mapping of tool name to its counters and circuit state
+        """
+        names = [tool_name] if tool_name else self.get_available_tools()
+        return {
+            name: {
+                **self._runtimes[name].stats.snapshot(),
+                "circuit": self._runtimes[name].breaker.state,
+            }
+            for name in names
+            if name in self._runtimes
+        }
 
 # Global registry instance
-tool_registry = ToolRegistry()
\ No newline at end of file
+tool_registry = ToolRegistry()
@@ -0,0 +1,99 @@
+import json
+import os
+from typing import Any, Dict, List, Tuple
+
+
+def parse_catalog(data: Any) -> List[Dict[str, Any]]:
+    """
+    Extract product dictionaries from a parsed catalog document.
+
+    Accepts the layouts used by the files under data/: a bare list of
+    products, {"products": [...]}, or a mapping of category name to a
+    list of products (as in data/seed_data/*.json).
+
+    Args:
+        data: Parsed JSON catalog document
+
+    Returns:
+        List of product dictionaries
+    """
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        if "products" in data and isinstance(data["products"], list):
+            return data["products"]
+        products = []
+        for value in data.values():
+            if isinstance(value, list):
+                products.extend(value)
+        return products
+    return []
+
+
+def load_catalog_file(path: str) -> List[Dict[str, Any]]:
+    """
+    Load every product from a JSON or JSON Lines catalog file.
+
+    Args:
+        path: Path to a .json or .jsonl catalog file
+
+    Returns:
+        List of product dictionaries
+    """
+    if path.endswith(".jsonl"):
+        return load_jsonl_range(path, 0, os.path.getsize(path))
+
+    with open(path, "r") as f:
+        return parse_catalog(json.load(f))
+
+
+def load_jsonl_range(path: str, start: int, end: int) -> List[Dict[str, Any]]:
+    """
+    Load the products stored in a byte range of a JSON Lines file.
+
+    The range must start and end on line boundaries, as produced by
+    split_jsonl().
+
+    Args:
+        path: Path to the .jsonl catalog file
+        start: Byte offset of the first line
+        end: Byte offset just past the last line
+
+    Returns:
+        List of product dictionaries
+    """
+    products = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        for line in f.read(end - start).splitlines():
+            if line.strip():
+                products.append(json.loads(line))
+    return products
+
+
+def split_jsonl(path: str, shard_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Split a JSON Lines file into byte ranges aligned to line boundaries.
+
+    Only seeks and reads to the next newline; lines are not parsed.
+
+    Args:
+        path: Path to the .jsonl catalog file
+        shard_bytes: Target size of each range in bytes
+
+    Returns:
+        List of (start, end) byte offsets covering the whole file
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    start = 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(start + shard_bytes, size)
+            if end < size:
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
@@ -1,9 +1,14 @@
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from firecrawl import FirecrawlApp
 
 
-def scrape_web_page(url: str, firecrawl_api_key: str) -> Dict[str, Any]:
+def scrape_web_page(
+    url: str,
+    firecrawl_api_key: str,
+    app: Optional[FirecrawlApp] = None,
+    api_url: Optional[str] = None,
+) -> Dict[str, Any]:
     """
     Scrape content from a web page using Firecrawl.
     
@@ -14,10 +19,14 @@ def scrape_web_page(url: str, firecrawl_api_key: str) -> Dict[str, Any]:
     Args:
         url: The URL of the web page to scrape
         firecrawl_api_key: API key for authenticating with Firecrawl
+        app: Preconfigured Firecrawl client to use instead of creating one
+        api_url: Alternate API endpoint, e.g. a local stub server
         
     Returns:
         Dictionary containing the scraped content in markdown and HTML formats
     """
-    app = FirecrawlApp(api_key=firecrawl_api_key)
+    if app is None:
+        kwargs = {"api_url": api_url} if api_url else {}
+        app = FirecrawlApp(api_key=firecrawl_api_key, **kwargs)
     scrape_result = app.scrape_url(url, formats=['markdown', 'html'])
     return scrape_result
@@ -0,0 +1,57 @@
+import threading
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Callers
+    block in acquire() until enough tokens are available, so a pool of
+    workers sharing one limiter never exceeds the API quota in aggregate.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Bucket size; defaults to one second of requests
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens from the bucket, waiting until they are available.
+
+        Args:
+            tokens: Number of tokens to take; at most the bucket size
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            ValueError: If more tokens are requested than the bucket holds
+        """
+        if tokens > self.burst:
+            raise ValueError(f"Cannot acquire {tokens} tokens from a bucket of {self.burst}")
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
@@ -1,6 +1,17 @@
 from typing import List, Dict, Any, Optional
 
+import requests
 from tavily import TavilyClient
+from tavily.errors import TimeoutError as TavilyTimeoutError, UsageLimitExceededError
+
+
+class TavilySearchError(ConnectionError):
+    """
+    A Tavily request failed for a transient reason.
+    
+    Raised for network errors, 5xx responses, rate limiting and timeouts,
+    so that callers can retry or back off.
+    """
 
 
 class TavilySearchClient:
@@ -11,14 +22,26 @@ class TavilySearchClient:
     searching for product information and competitor pricing.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[TavilyClient] = None,
+        api_base_url: Optional[str] = None,
+    ):
         """
         Initialize the Tavily search client.
         
         Args:
             api_key: API key for authenticating with Tavily
+            client: Preconfigured Tavily client to use instead of creating one
+            api_base_url: Alternate API endpoint, e.g. a local stub server
         """
-        self.client = TavilyClient(api_key=api_key)
+        if client is None:
+            client = TavilyClient(api_key=api_key)
+            if api_base_url:
+                # TavilyClient builds request URLs from base_url on every call
+                client.base_url = api_base_url.rstrip("/")
+        self.client = client
     
     def search_product(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
@@ -33,6 +56,10 @@ class TavilySearchClient:
             
         Returns:
             List of search results containing product information
+        
+        Raises:
+            TavilySearchError: On network errors, server errors, rate
+                limiting or timeouts
         """
         try:
             response = self.client.search(
@@ -40,6 +67,6 @@ class TavilySearchClient:
                 search_depth="basic",
                 max_results=max_results
             )
-            return response.get("results", [])
-        except Exception as e:
-            return []
+        except (requests.RequestException, TavilyTimeoutError, UsageLimitExceededError) as e:
+            raise TavilySearchError(f"Tavily search failed: {str(e)}") from e
+        return response.get("results", [])